@@ -6,9 +6,10 @@ Handles environment variables and application settings.
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import List, Literal, Optional, Union
 
-from pydantic import Field, validator
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -33,6 +34,10 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     reload: bool = False
+    workers: int = Field(
+        default_factory=lambda: max(1, (os.cpu_count() or 2) // 2),
+        description="Number of uvicorn worker processes"
+    )
     
     # Database
     database_url: str = Field(
@@ -40,9 +45,10 @@ class Settings(BaseSettings):
         description="PostgreSQL connection URL"
     )
     database_echo: bool = False
-    database_pool_size: int = 10
-    database_max_overflow: int = 20
-    database_pool_timeout: int = 30
+    database_pool_size: int = 20  # persistent connections kept warm per process
+    database_max_overflow: int = 10  # short-lived extras for bursts
+    database_pool_timeout: int = 5
+    database_statement_cache_size: int = 512
     
     # Redis (Task Queue)
     redis_url: str = Field(
@@ -67,10 +73,18 @@ class Settings(BaseSettings):
     max_concurrent_tasks: int = 100
     task_retry_attempts: int = 3
     
+    # User Sessions
+    session_ttl_days: int = 30
+    session_cleanup_interval_minutes: int = 60  # expired-session sweep period
+    session_activity_refresh_seconds: int = 300  # min gap between last_activity writes
+    
     # ML Model
     model_name: str = "cardiffnlp/twitter-roberta-base-sentiment-latest"
     model_cache_dir: str = "./models"
+    model_path: str = "./models/sentiment_model.pkl"
+    vectorizer_path: str = "./models/vectorizer.pkl"
     batch_size: int = 32
+    sentiment_cache_ttl_seconds: int = 86400  # Redis TTL of cached sentiment results
     
     # Security
     secret_key: str = Field(..., description="Secret key for JWT and other crypto operations")
@@ -106,23 +120,37 @@ class Settings(BaseSettings):
     docs_url: Optional[str] = "/docs"
     redoc_url: Optional[str] = "/redoc"
     
-    @validator("show_docs", pre=True, always=True)
-    def validate_docs_visibility(cls, v, values):
+    @model_validator(mode="after")
+    def validate_docs_visibility(self) -> Settings:
         """Hide docs in production unless explicitly enabled."""
-        if values.get("environment") == "production" and v is True:
+        if self.environment == "production" and self.show_docs is True:
             # In production, explicitly check if docs should be shown
-            return os.getenv("FORCE_SHOW_DOCS", "false").lower() == "true"
-        return v
+            self.show_docs = os.getenv("FORCE_SHOW_DOCS", "false").lower() == "true"
+        return self
     
-    @validator("openapi_url", "docs_url", "redoc_url", pre=True, always=True)
-    def validate_docs_urls(cls, v, values):
+    @model_validator(mode="after")
+    def validate_docs_urls(self) -> Settings:
         """Set docs URLs to None if docs are disabled."""
-        if not values.get("show_docs", True):
-            return None
+        if not self.show_docs:
+            self.openapi_url = None
+            self.docs_url = None
+            self.redoc_url = None
+        return self
+    
+    @field_validator("database_url")
+    @classmethod
+    def validate_database_url(cls, v: str) -> str:
+        """Route plain/psycopg PostgreSQL URLs through the asyncpg driver."""
+        for prefix in (
+            "postgresql://", "postgres://", "postgresql+psycopg2://", "postgresql+psycopg://"
+        ):
+            if v.startswith(prefix):
+                return "postgresql+asyncpg://" + v[len(prefix):]
         return v
     
-    @validator("max_file_size_mb")
-    def validate_file_size(cls, v):
+    @field_validator("max_file_size_mb")
+    @classmethod
+    def validate_file_size(cls, v: int) -> int:
         """Ensure file size is reasonable."""
         if v <= 0 or v > 100:
             raise ValueError("File size must be between 1 and 100 MB")
@@ -144,5 +172,14 @@ class Settings(BaseSettings):
         return self.environment == "production"
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Get the process-wide settings instance, created on first use."""
+    return Settings()
+
+
+def __getattr__(name: str):
+    """Resolve the module-level ``settings`` lazily via get_settings()."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,36 +1,37 @@
 """
 Database configuration and session management.
-"""
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import redis
+Review models share the declarative Base and the engine/session factory
+from app.infra.db.base, so the process holds a single connection pool.
+"""
 
-from app.core.config import settings
+from typing import AsyncGenerator
 
-# SQLAlchemy database engine
-engine = create_engine(settings.DATABASE_URL)
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
 
-# Session maker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.core.config import settings
+from app.infra.db.base import Base, get_session_factory
 
-# Base class for SQLAlchemy models
-Base = declarative_base()
+# Base is re-exported for the review models
+__all__ = [
+    "Base",
+    "get_db",
+    "get_redis",
+    "redis_client"
+]
 
 # Redis client
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+redis_client = aioredis.from_url(settings.redis_url, decode_responses=True)
 
 
-def get_db():
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session."""
-    db = SessionLocal()
-    try:
+    session_factory = get_session_factory()
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_redis():
+def get_redis() -> aioredis.Redis:
     """Dependency to get Redis client."""
     return redis_client
@@ -7,7 +7,7 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.core.logging import get_logger
@@ -79,15 +79,15 @@ class InternalServerError(BaseAppException):
 
 
 # Exception handlers
-async def validation_exception_handler(request: Request, exc: ValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: ValidationError) -> ORJSONResponse:
     """Handle validation errors."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=exc.to_dict()
     )
 
 
-async def app_exception_handler(request: Request, exc: BaseAppException) -> JSONResponse:
+async def app_exception_handler(request: Request, exc: BaseAppException) -> ORJSONResponse:
     """Handle custom application exceptions."""
     logger.error(
         f"Application error: {exc.message}",
@@ -97,13 +97,13 @@ async def app_exception_handler(request: Request, exc: BaseAppException) -> JSON
             "details": exc.details,
         }
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=exc.to_dict()
     )
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handle unexpected exceptions."""
     logger.error(
         f"Unexpected error: {str(exc)}",
@@ -122,7 +122,7 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
             details={"exception_type": exc.__class__.__name__}
         )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=error.status_code,
         content=error.to_dict()
     )
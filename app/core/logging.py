@@ -4,56 +4,162 @@ Structured JSON logging with correlation ID support.
 
 from __future__ import annotations
 
-import json
+import atexit
+import copy
 import logging
+import queue
+import re
+import secrets
 import sys
-import uuid
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
+import orjson
 from pythonjsonlogger import jsonlogger
 
 # Context variable for request correlation ID
 request_id_context: ContextVar[str] = ContextVar("request_id", default="")
+_current_request_id = request_id_context.get
+
+# Background listener writing queued log records to stdout
+_queue_listener: QueueListener | None = None
+
+# Substrings marking a log field as sensitive, matched case-insensitively
+SENSITIVE_FIELDS = frozenset({
+    "password", "token", "key", "secret", "auth", "credential",
+    "jwt", "bearer", "authorization", "x-api-key"
+})
+SENSITIVE_FIELD_PATTERN = re.compile(
+    "|".join(re.escape(field) for field in sorted(SENSITIVE_FIELDS)),
+    re.IGNORECASE
+)
 
 
 class CorrelationFilter(logging.Filter):
     """Add correlation ID to log records."""
     
     def filter(self, record: logging.LogRecord) -> bool:
-        record.request_id = request_id_context.get("")
+        record.request_id = _current_request_id()
         return True
 
 
 class SecretMaskingFormatter(jsonlogger.JsonFormatter):
     """Custom JSON formatter with secret masking."""
     
-    SENSITIVE_FIELDS = {
-        "password", "token", "key", "secret", "auth", "credential",
-        "jwt", "bearer", "authorization", "x-api-key"
-    }
+    SENSITIVE_FIELDS = SENSITIVE_FIELDS
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Format fields are fixed, so classify them once instead of per record
+        self._masked_required_fields = tuple(
+            field for field in self._required_fields if _is_sensitive_key(field)
+        )
+        self._fixed_shape = not (self.rename_fields or self.static_fields or self.timestamp)
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format record as JSON with the format fields first, then extras.
+        
+        Only the dynamic extra fields are checked for sensitive keys; the
+        generic pythonjsonlogger path is used when renames, static fields or
+        timestamps are configured.
+        """
+        if not self._fixed_shape:
+            return super().format(record)
+        
+        if isinstance(record.msg, dict):
+            extra = dict(record.msg)
+            record.message = ""
+        else:
+            extra = {}
+            record.message = record.getMessage()
+        if "asctime" in self._required_fields:
+            record.asctime = self.formatTime(record, self.datefmt)
+        
+        if record.exc_info and not extra.get("exc_info"):
+            extra["exc_info"] = self.formatException(record.exc_info)
+        if not extra.get("exc_info") and record.exc_text:
+            extra["exc_info"] = record.exc_text
+        if record.stack_info and not extra.get("stack_info"):
+            extra["stack_info"] = self.formatStack(record.stack_info)
+        
+        record_dict = record.__dict__
+        log_record = {field: record_dict.get(field) for field in self._required_fields}
+        for field in self._masked_required_fields:
+            log_record[field] = _mask_value(log_record[field])
+        
+        skip_fields = self._skip_fields
+        for key, value in record_dict.items():
+            if key not in skip_fields and not (isinstance(key, str) and key.startswith("_")):
+                extra[key] = value
+        
+        log_record.update(self.process_log_record(extra))
+        return self.serialize_log_record(log_record)
     
     def process_log_record(self, log_record: dict[str, Any]) -> dict[str, Any]:
         """Process log record and mask sensitive information."""
-        # Mask sensitive fields
+        # Mask sensitive fields (helpers bound to locals, this runs per record)
+        is_sensitive, mask = _is_sensitive_key, _mask_value
         for key, value in log_record.items():
-            if any(sensitive in key.lower() for sensitive in self.SENSITIVE_FIELDS):
-                if isinstance(value, str) and len(value) > 8:
-                    log_record[key] = f"{value[:4]}***{value[-4:]}"
-                else:
-                    log_record[key] = "***masked***"
+            if is_sensitive(key):
+                log_record[key] = mask(value)
         
         return log_record
+    
+    def jsonify_log_record(self, log_record: dict[str, Any]) -> str:
+        """Serialize log record with orjson (always UTF-8, non-JSON values via str)."""
+        return orjson.dumps(log_record, default=self.json_default or str).decode()
+
+
+class DeferredFormatQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves JSON formatting to the listener thread.
+    
+    Only the message arguments and traceback are resolved on the caller's
+    thread; extra fields and exc_info text survive for the JSON formatter.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+@lru_cache(maxsize=1024)
+def _is_sensitive_key(key: str) -> bool:
+    """Check whether a field name looks sensitive; log keys repeat, so cache it."""
+    return SENSITIVE_FIELD_PATTERN.search(key) is not None
+
+
+def _mask_value(value: Any) -> str:
+    """Mask a sensitive value, keeping the edges of long strings."""
+    if isinstance(value, str) and len(value) > 8:
+        return f"{value[:4]}***{value[-4:]}"
+    return "***masked***"
 
 
 def configure_logging(log_level: str = "INFO") -> None:
-    """Configure structured JSON logging."""
+    """
+    Configure structured JSON logging.
+    
+    Records are enqueued by a QueueHandler on the calling thread and written
+    to stdout by a QueueListener thread, so request handlers never block on
+    formatting or console I/O.
+    """
+    global _queue_listener
     
     # Create custom formatter
     formatter = SecretMaskingFormatter(
         fmt="%(asctime)s %(name)s %(levelname)s %(request_id)s %(message)s",
-        datefmt="%Y-%m-%dT%H:%M:%S",
-        json_ensure_ascii=False
+        datefmt="%Y-%m-%dT%H:%M:%S"
     )
     
     # Configure root logger
@@ -63,13 +169,21 @@ def configure_logging(log_level: str = "INFO") -> None:
     # Remove existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    stop_logging()
     
-    # Create console handler
+    # Create console handler, driven by the background listener
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    console_handler.addFilter(CorrelationFilter())
     
-    root_logger.addHandler(console_handler)
+    # Correlation ID lives in a ContextVar, so it is captured before enqueueing
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = DeferredFormatQueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationFilter())
+    
+    root_logger.addHandler(queue_handler)
+    
+    _queue_listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _queue_listener.start()
     
     # Set library log levels to avoid spam
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -77,18 +191,40 @@ def configure_logging(log_level: str = "INFO") -> None:
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
 
+def stop_logging() -> None:
+    """Stop the background log listener, flushing records still queued."""
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(stop_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get logger with correlation support."""
     return logging.getLogger(name)
 
 
-def set_request_id(request_id: str | None = None) -> str:
-    """Set request ID in context. Generate if not provided."""
+def set_request_id(request_id: str | None = None) -> Token[str]:
+    """
+    Set request ID in context. Generate if not provided.
+    
+    Returns the context token; pass it to reset_request_id() once the
+    request is done so the ID does not leak into the enclosing context.
+    """
     if not request_id:
-        request_id = str(uuid.uuid4())
+        # 128 random bits as 32 hex chars, without building a UUID object
+        request_id = secrets.token_hex(16)
     
-    request_id_context.set(request_id)
-    return request_id
+    return request_id_context.set(request_id)
+
+
+def reset_request_id(token: Token[str]) -> None:
+    """Restore the request ID that was current before set_request_id()."""
+    request_id_context.reset(token)
 
 
 def get_request_id() -> str:
@@ -104,19 +240,16 @@ def mask_sensitive_data(data: dict[str, Any]) -> dict[str, Any]:
         user_data = {"name": "John", "password": "secret123", "email": "john@example.com"}
         safe_data = mask_sensitive_data(user_data)
         logger.info("User data processed", extra={"user": safe_data})
-    """
-    masked_data = data.copy()
     
-    sensitive_fields = {
-        "password", "token", "key", "secret", "auth", "credential",
-        "jwt", "bearer", "authorization", "x-api-key"
-    }
+    The input is returned as is when no field is sensitive; a copy is made
+    only once a value has to be masked, so treat the result as read-only.
+    """
+    masked_data = None
     
-    for key, value in masked_data.items():
-        if any(sensitive in key.lower() for sensitive in sensitive_fields):
-            if isinstance(value, str) and len(value) > 8:
-                masked_data[key] = f"{value[:4]}***{value[-4:]}"
-            else:
-                masked_data[key] = "***masked***"
+    for key, value in data.items():
+        if _is_sensitive_key(key):
+            if masked_data is None:
+                masked_data = dict(data)
+            masked_data[key] = _mask_value(value)
     
-    return masked_data
+    return masked_data if masked_data is not None else data
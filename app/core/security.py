@@ -4,104 +4,174 @@ Security utilities and middleware for the application.
 
 from __future__ import annotations
 
-import uuid
+import hashlib
+import re
+import time
+from functools import lru_cache
 from typing import Any
 
+import orjson
+
 from fastapi import HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security.utils import get_authorization_scheme_param
+from starlette.datastructures import URL, Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
-from app.core.logging import get_logger, set_request_id
+from app.core.logging import get_logger, get_request_id, reset_request_id, set_request_id
 
 logger = get_logger(__name__)
 
+# Potential XSS patterns stripped from input text (basic protection)
+XSS_PATTERN = re.compile(r"<script|</script|javascript:|onclick|onerror", re.IGNORECASE)
+
+# Allowed upload extensions (with leading dot), normalized once at import
+ALLOWED_EXTENSIONS = frozenset(ext.lower() for ext in settings.allowed_extensions)
+
+# Security headers added to every response, also prebuilt in Starlette's
+# raw (lowercase latin-1 bytes) form
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Content-Security-Policy": "default-src 'self'",
+}
+SECURITY_HEADERS_RAW = tuple(
+    (name.lower().encode("latin-1"), value.encode("latin-1"))
+    for name, value in SECURITY_HEADERS.items()
+)
+SECURITY_HEADER_NAMES = frozenset(name for name, _ in SECURITY_HEADERS_RAW)
+
+# Shared detail for malformed JSON bodies; the exception itself is created per
+# raise, since a shared instance would accumulate tracebacks across requests
+INVALID_JSON_DETAIL = "Invalid JSON"
 
-class RequestTrackingMiddleware(BaseHTTPMiddleware):
-    """Middleware for request tracking and correlation ID management."""
+
+class RequestTrackingMiddleware:
+    """
+    Middleware for request tracking and correlation ID management.
     
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Extract or generate request ID
-        request_id = (
-            request.headers.get("X-Request-ID") or
-            request.headers.get("X-Correlation-ID") or
-            str(uuid.uuid4())
-        )
+    Pure ASGI: the request ID header is added to the response start message
+    directly, with no Request/Response wrappers or body streaming in between.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Set request ID in context
-        set_request_id(request_id)
+        headers = Headers(scope=scope)
         
-        # Log incoming request
-        if settings.enable_request_logging:
-            logger.info(
-                "Incoming request",
-                extra={
-                    "method": request.method,
-                    "url": str(request.url),
-                    "client_ip": request.client.host if request.client else None,
-                    "user_agent": request.headers.get("user-agent"),
-                }
-            )
+        # Extract request ID (generated by set_request_id if absent) and set it in context
+        token = set_request_id(
+            headers.get("x-request-id") or
+            headers.get("x-correlation-id")
+        )
+        request_id = get_request_id()
         
-        # Process request
-        response = await call_next(request)
+        # Resolve client address once; downstream helpers reuse it from state
+        client = scope.get("client")
+        client_ip = client[0] if client else None
+        scope.setdefault("state", {})["client_ip"] = client_ip
         
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
+        start_time = time.perf_counter()
+        status_code = None
         
-        # Log response
-        if settings.enable_request_logging:
-            logger.info(
-                "Request completed",
-                extra={
-                    "status_code": response.status_code,
-                    "response_time_ms": getattr(request.state, "response_time", 0),
-                }
-            )
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
         
-        return response
+        try:
+            # Process request
+            await self.app(scope, receive, send_wrapper)
+            
+            # Log a single access record with request and response details
+            if settings.enable_request_logging:
+                logger.info(
+                    "Request completed",
+                    extra={
+                        "method": scope["method"],
+                        "url": str(URL(scope=scope)),
+                        "client_ip": client_ip,
+                        "user_agent": headers.get("user-agent"),
+                        "status_code": status_code,
+                        "response_time_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                    }
+                )
+        finally:
+            reset_request_id(token)
 
 
 class SanitizationMiddleware(BaseHTTPMiddleware):
     """Middleware for sanitizing incoming request data."""
     
     async def dispatch(self, request: Request, call_next) -> Response:
-        # Only sanitize JSON body for POST requests
-        if request.method == "POST" and "application/json" in request.headers.get("content-type", ""):
-            body = await request.body()
-            if body:
-                import json
-                try:
-                    data = json.loads(body)
-                    if isinstance(data, dict):
-                        sanitized_data = {k: sanitize_text(v) if isinstance(v, str) else v for k, v in data.items()}
-                        request._body = json.dumps(sanitized_data).encode('utf-8')
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    # If parsing fails, continue without sanitization
-                    raise HTTPException(status_code=422, detail="Invalid JSON")
-
-        response = await call_next(request)
-        return response
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware for adding security headers."""
+        # Only sanitize JSON body for POST requests; anything else (e.g.
+        # multipart uploads) is passed through without reading the body
+        if request.method != "POST":
+            return await call_next(request)
+        
+        content_type = request.headers.get("content-type")
+        if not content_type or not content_type.startswith("application/json"):
+            return await call_next(request)
+        
+        body = await request.body()
+        if body:
+            try:
+                data = orjson.loads(body)
+                if isinstance(data, dict):
+                    dirty = False
+                    for k, v in data.items():
+                        if isinstance(v, str):
+                            sanitized = sanitize_text(v)
+                            if sanitized != v:
+                                data[k] = sanitized
+                                dirty = True
+                    # Re-serialize only when sanitization changed something
+                    if dirty:
+                        request._body = orjson.dumps(data)
+                # Share the parsed body with downstream consumers via scope state
+                request.state.parsed_body = data
+            except orjson.JSONDecodeError:
+                # If parsing fails, continue without sanitization
+                raise HTTPException(status_code=422, detail=INVALID_JSON_DETAIL)
+        
+        return await call_next(request)
+
+class SecurityHeadersMiddleware:
+    """Middleware for adding security headers (pure ASGI)."""
     
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Add security headers
-        response.headers.update({
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "X-XSS-Protection": "1; mode=block",
-            "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-            "Content-Security-Policy": "default-src 'self'",
-        })
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add security headers; append prebuilt raw pairs unless one is already set
+                headers = MutableHeaders(scope=message)
+                if any(name in SECURITY_HEADER_NAMES for name, _ in headers.raw):
+                    headers.update(SECURITY_HEADERS)
+                else:
+                    headers.raw.extend(SECURITY_HEADERS_RAW)
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_wrapper)
 
 
 def setup_cors(app) -> None:
@@ -126,17 +196,21 @@ async def extract_user_id_from_request(request: Request) -> str:
     3. Could be extended to use proper authentication
     """
     # Step 1: Check for user_id in request body (for POST requests)
-    if request.method == "POST":
+    body_data = getattr(request.state, "parsed_body", None)
+    if body_data is not None:
+        # Body was already parsed by SanitizationMiddleware
+        if isinstance(body_data, dict) and "user_id" in body_data:
+            return str(body_data["user_id"])
+    elif request.method == "POST":
         try:
             body = await request.body()
             if body:
                 # Try to parse JSON body
-                import json
                 try:
-                    body_data = json.loads(body.decode())
+                    body_data = orjson.loads(body)
                     if isinstance(body_data, dict) and "user_id" in body_data:
                         return str(body_data["user_id"])
-                except (json.JSONDecodeError, UnicodeDecodeError):
+                except orjson.JSONDecodeError:
                     # If parsing fails, continue to fallback
                     pass
         except Exception:
@@ -144,19 +218,27 @@ async def extract_user_id_from_request(request: Request) -> str:
             pass
     
     # Step 2: Check for user_id in headers
-    user_id_header = request.headers.get("X-User-ID") or request.headers.get("User-ID")
+    headers = request.headers
+    user_id_header = headers.get("x-user-id") or headers.get("user-id")
     if user_id_header:
         return user_id_header
     
     # Step 3: Generate a session-based ID from client info (fallback)
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is None:
+        client_ip = request.client.host if request.client else "unknown"
+    user_agent = headers.get("user-agent", "unknown")
     
     # Generate a consistent ID based on client info
     # In production, this should be replaced with proper user authentication
-    session_id = f"session_{client_ip}_{hash(user_agent) % 10000}"
-    
-    return session_id
+    return _session_fingerprint(client_ip, user_agent)
+
+
+@lru_cache(maxsize=1024)
+def _session_fingerprint(client_ip: str, user_agent: str) -> str:
+    """Build a session ID stable across processes and restarts (unlike hash())."""
+    digest = hashlib.blake2b(f"{client_ip}|{user_agent}".encode(), digest_size=8).hexdigest()
+    return f"session_{digest}"
 
 
 def validate_file_type(filename: str) -> bool:
@@ -165,13 +247,13 @@ def validate_file_type(filename: str) -> bool:
         return False
     
     # Check extension
-    file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
-    return f".{file_ext}" in settings.allowed_extensions
+    dot = filename.rfind(".")
+    return dot != -1 and filename[dot:].lower() in ALLOWED_EXTENSIONS
 
 
 def validate_file_size(file_size: int) -> bool:
     """Validate if file size is within limits."""
-    return 0 < file_size <= settings.max_file_size_mb * 1024 * 1024
+    return 0 < file_size <= settings.max_file_size_bytes
 
 
 def sanitize_text(text: str) -> str:
@@ -179,15 +261,8 @@ def sanitize_text(text: str) -> str:
     if not text:
         return ""
     
-    # Basic sanitization
-    sanitized = text.strip()
-    
-    # Remove potential XSS patterns (basic protection)
-    dangerous_patterns = ["<script", "</script", "javascript:", "onclick", "onerror"]
-    for pattern in dangerous_patterns:
-        sanitized = sanitized.replace(pattern, "")
-    
-    return sanitized
+    # Strip whitespace and remove potential XSS patterns in a single pass
+    return XSS_PATTERN.sub("", text.strip())
 
 
 def create_api_error(
@@ -196,8 +271,5 @@ def create_api_error(
     status_code: int = status.HTTP_400_BAD_REQUEST
 ) -> HTTPException:
     """Create standardized API error response."""
-    error_content = {"message": message}
-    if details:
-        error_content["details"] = details
-    
+    error_content = {"message": message, "details": details} if details else {"message": message}
     return HTTPException(status_code=status_code, detail=error_content)
@@ -9,10 +9,12 @@ This module provides:
 """
 
 from typing import AsyncGenerator, Optional, Tuple
-from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import MetaData, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+)
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
@@ -35,7 +37,9 @@ class Base(DeclarativeBase):
     metadata = metadata
 
 
-async def create_engine_session(database_url: str) -> Tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+async def create_engine_session(
+    database_url: str,
+) -> Tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
     """
     Create async database engine and session factory.
     
@@ -50,20 +54,32 @@ async def create_engine_session(database_url: str) -> Tuple[AsyncEngine, async_s
     engine_kwargs = {
         "echo": settings.database_echo,
         "future": True,
+        "query_cache_size": 1200,  # room for every statement shape in the app
     }
     
-    # Use NullPool for SQLite (testing), connection pool for PostgreSQL
+    # Pool SQLite file connections too, so they and their page cache outlive
+    # a request (:memory: keeps the dialect's single static connection)
     if database_url.startswith("sqlite"):
-        engine_kwargs["poolclass"] = NullPool
         engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if make_url(database_url).database not in (None, "", ":memory:"):
+            engine_kwargs["poolclass"] = AsyncAdaptedQueuePool
     else:
         # PostgreSQL connection pool settings
         engine_kwargs.update({
             "pool_size": settings.database_pool_size,
             "max_overflow": settings.database_max_overflow,
+            "pool_timeout": settings.database_pool_timeout,  # fail fast under overload
             "pool_pre_ping": True,
             "pool_recycle": 3600,  # 1 hour
+            "pool_use_lifo": True,  # keep hot connections hot, let idle ones expire
         })
+        
+        if database_url.startswith("postgresql+asyncpg"):
+            # Reuse prepared statements per connection: repeated queries skip parse/plan
+            engine_kwargs["connect_args"] = {
+                "prepared_statement_cache_size": settings.database_statement_cache_size,
+                "server_settings": {"jit": "off"},
+            }
     
     engine = create_async_engine(database_url, **engine_kwargs)
     
@@ -79,7 +95,9 @@ async def create_engine_session(database_url: str) -> Tuple[AsyncEngine, async_s
     return engine, session_factory
 
 
-async def get_db_session(session_factory: async_sessionmaker[AsyncSession]) -> AsyncGenerator[AsyncSession, None]:
+async def get_db_session(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[AsyncSession, None]:
     """
     Database session dependency for FastAPI.
     
@@ -100,9 +118,30 @@ async def get_db_session(session_factory: async_sessionmaker[AsyncSession]) -> A
             await session.close()
 
 
+async def get_db_session_ro(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only database session dependency for FastAPI.
+    
+    Nothing is committed; use with the factory from
+    get_read_only_session_factory(), whose connections run in autocommit
+    mode so pure SELECT handlers skip the BEGIN/COMMIT round-trips.
+    
+    Args:
+        session_factory: Async session factory
+    
+    Yields:
+        Database session
+    """
+    async with session_factory() as session:
+        yield session
+
+
 # Global variables for application state
 _engine: Optional[AsyncEngine] = None
 _session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_read_only_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 
 
 async def init_db(database_url: str) -> None:
@@ -112,19 +151,28 @@ async def init_db(database_url: str) -> None:
     Args:
         database_url: Database connection URL
     """
-    global _engine, _session_factory
+    global _engine, _session_factory, _read_only_session_factory
     
     _engine, _session_factory = await create_engine_session(database_url)
+    
+    # Same pool, but statements run outside explicit transactions
+    _read_only_session_factory = async_sessionmaker(
+        _engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
 
 
 async def close_db() -> None:
     """Close database engine and cleanup resources."""
-    global _engine, _session_factory
+    global _engine, _session_factory, _read_only_session_factory
     
     if _engine:
         await _engine.dispose()
         _engine = None
         _session_factory = None
+        _read_only_session_factory = None
 
 
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
@@ -143,6 +191,22 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     return _session_factory
 
 
+def get_read_only_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Get session factory for read-only (autocommit) sessions.
+    
+    Returns:
+        Read-only session factory instance
+    
+    Raises:
+        RuntimeError: If database is not initialized
+    """
+    if _read_only_session_factory is None:
+        raise RuntimeError("Database is not initialized. Call init_db() first.")
+    
+    return _read_only_session_factory
+
+
 def get_engine() -> AsyncEngine:
     """
     Get current database engine.
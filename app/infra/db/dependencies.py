@@ -12,8 +12,8 @@ from typing import AsyncGenerator
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.db.base import get_session_factory
-from app.infra.db.repo import TaskRepository, UserSessionRepository
+from app.infra.db import base
+from app.infra.db.repo import TaskReadRepository, TaskRepository, UserSessionRepository
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -23,17 +23,19 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         Database session with automatic transaction management
     """
-    session_factory = get_session_factory()
+    async for session in base.get_db_session(base.get_session_factory()):
+        yield session
+
+
+async def get_db_session_ro() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only database session dependency for FastAPI.
     
-    async with session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    Yields:
+        Autocommit database session; nothing is committed on exit
+    """
+    async for session in base.get_db_session_ro(base.get_read_only_session_factory()):
+        yield session
 
 
 def get_task_repository(
@@ -44,13 +46,28 @@ def get_task_repository(
     
     Args:
         session: Database session from dependency
-        
+    
     Returns:
         TaskRepository instance
     """
     return TaskRepository(session)
 
 
+def get_read_task_repository(
+    session: AsyncSession = Depends(get_db_session_ro)
+) -> TaskReadRepository:
+    """
+    Get Core-row task repository instance bound to a read-only session.
+    
+    Args:
+        session: Read-only database session from dependency
+        
+    Returns:
+        TaskReadRepository instance
+    """
+    return TaskReadRepository(session)
+
+
 def get_user_session_repository(
     session: AsyncSession = Depends(get_db_session)
 ) -> UserSessionRepository:
@@ -0,0 +1,52 @@
+"""Native task_status enum, partial index for active tasks, server-side timestamps
+
+Revision ID: 002_task_status_enum
+Revises: 001_initial
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002_task_status_enum'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+task_status = postgresql.ENUM('accepted', 'queued', 'ready', 'error', name='task_status')
+
+
+def upgrade() -> None:
+    # Store status as a 4-byte native enum instead of varchar
+    task_status.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        'tasks', 'status',
+        type_=task_status,
+        existing_nullable=False,
+        postgresql_using='status::task_status'
+    )
+    
+    # Only non-terminal tasks are indexed for "active tasks by user" lookups
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_updated")
+    op.create_index(
+        'idx_tasks_active', 'tasks', ['user_id', 'updated_at'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('accepted', 'queued')")
+    )
+    
+    # Timestamps are filled in by the database
+    op.alter_column('tasks', 'created_at', server_default=sa.text('now()'), existing_nullable=False)
+    op.alter_column('tasks', 'updated_at', server_default=sa.text('now()'), existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tasks_active', table_name='tasks')
+    op.alter_column(
+        'tasks', 'status',
+        type_=sa.String(length=20),
+        existing_nullable=False,
+        postgresql_using='status::text'
+    )
+    task_status.drop(op.get_bind(), checkfirst=True)
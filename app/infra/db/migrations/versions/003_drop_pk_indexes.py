@@ -0,0 +1,33 @@
+"""Drop secondary indexes duplicating primary keys
+
+Downgrade restores only ix_tasks_id, the one created by 001_initial, so
+that 001's downgrade can drop it again; the others come from
+metadata.create_all and are not part of the migration history.
+
+Revision ID: 003_drop_pk_indexes
+Revises: 002_task_status_enum
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003_drop_pk_indexes'
+down_revision = '002_task_status_enum'
+branch_labels = None
+depends_on = None
+
+# Names used by 001_initial and by metadata.create_all (naming convention)
+PK_DUPLICATE_INDEXES = (
+    'ix_tasks_id', 'tasks_id_idx', 'ix_user_sessions_id', 'user_sessions_id_idx'
+)
+
+
+def upgrade() -> None:
+    # Primary keys already have a unique btree index
+    for index_name in PK_DUPLICATE_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tasks_id ON tasks (id)")
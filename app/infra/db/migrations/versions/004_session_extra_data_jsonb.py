@@ -0,0 +1,29 @@
+"""Store user_sessions.extra_data as JSONB
+
+Revision ID: 004_session_extra_data_jsonb
+Revises: 003_drop_pk_indexes
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_session_extra_data_jsonb'
+down_revision = '003_drop_pk_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # user_sessions is created by metadata.create_all, so it may not exist yet
+    op.execute(
+        "ALTER TABLE IF EXISTS user_sessions "
+        "ALTER COLUMN extra_data TYPE jsonb USING extra_data::jsonb"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE IF EXISTS user_sessions "
+        "ALTER COLUMN extra_data TYPE json USING extra_data::json"
+    )
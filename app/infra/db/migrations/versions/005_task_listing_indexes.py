@@ -0,0 +1,45 @@
+"""Composite indexes for task listing queries
+
+Revision ID: 005_task_listing_indexes
+Revises: 004_session_extra_data_jsonb
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_task_listing_indexes'
+down_revision = '004_session_extra_data_jsonb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # get_user_tasks: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+    op.create_index(
+        'idx_tasks_user_created',
+        'tasks',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    # get_last_user_task: WHERE user_id = ? AND type = ? ORDER BY start DESC
+    op.create_index(
+        'idx_tasks_user_type_start',
+        'tasks',
+        ['user_id', 'type', sa.text('start DESC')],
+        unique=False,
+    )
+    # get_tasks_by_status: WHERE status = ? ORDER BY created_at
+    op.create_index(
+        'idx_tasks_status_created',
+        'tasks',
+        ['status', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tasks_status_created', table_name='tasks')
+    op.drop_index('idx_tasks_user_type_start', table_name='tasks')
+    op.drop_index('idx_tasks_user_created', table_name='tasks')
@@ -0,0 +1,26 @@
+"""Store task start/end Unix timestamps as BIGINT
+
+Revision ID: 006_task_epoch_bigint
+Revises: 005_task_listing_indexes
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_task_epoch_bigint'
+down_revision = '005_task_listing_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Epoch seconds overflow a 4-byte INTEGER in 2038
+    op.alter_column('tasks', 'start', type_=sa.BigInteger(), existing_type=sa.Integer())
+    op.alter_column('tasks', 'end', type_=sa.BigInteger(), existing_type=sa.Integer())
+
+
+def downgrade() -> None:
+    op.alter_column('tasks', 'end', type_=sa.Integer(), existing_type=sa.BigInteger())
+    op.alter_column('tasks', 'start', type_=sa.Integer(), existing_type=sa.BigInteger())
@@ -0,0 +1,37 @@
+"""Order the user sessions activity index by last_activity DESC
+
+Revision ID: 007_session_activity_desc
+Revises: 006_task_epoch_bigint
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007_session_activity_desc'
+down_revision = '006_task_epoch_bigint'
+branch_labels = None
+depends_on = None
+
+
+def _recreate_activity_index(order: str) -> None:
+    # user_sessions is created by metadata.create_all, so it may not exist yet
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF to_regclass('user_sessions') IS NOT NULL THEN
+                DROP INDEX IF EXISTS idx_user_sessions_user_activity;
+                CREATE INDEX idx_user_sessions_user_activity
+                    ON user_sessions (user_id, last_activity {order});
+            END IF;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    # get_user_sessions: WHERE user_id = ? ORDER BY last_activity DESC
+    _recreate_activity_index('DESC')
+
+
+def downgrade() -> None:
+    _recreate_activity_index('ASC')
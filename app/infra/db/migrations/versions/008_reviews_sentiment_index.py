@@ -0,0 +1,41 @@
+"""Index reviews by (sentiment, id)
+
+Revision ID: 008_reviews_sentiment_index
+Revises: 007_session_activity_desc
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_reviews_sentiment_index'
+down_revision = '007_session_activity_desc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # reviews is created by metadata.create_all, so it may not exist yet
+    if not sa.inspect(op.get_bind()).has_table('reviews'):
+        return
+    # Build without blocking writes; CONCURRENTLY cannot run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reviews_sentiment_id',
+            'reviews',
+            ['sentiment', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_reviews_sentiment_id',
+            table_name='reviews',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
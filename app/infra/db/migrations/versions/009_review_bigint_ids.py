@@ -0,0 +1,43 @@
+"""BIGINT ids for reviews and analysis sessions, drop duplicate PK indexes
+
+Revision ID: 009_review_bigint_ids
+Revises: 008_reviews_sentiment_index
+Create Date: 2026-10-15 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009_review_bigint_ids'
+down_revision = '008_reviews_sentiment_index'
+branch_labels = None
+depends_on = None
+
+# Tables created by metadata.create_all, with their (naming convention) PK duplicates
+TABLES = {
+    'reviews': ('reviews_id_idx', 'ix_reviews_id'),
+    'analysis_sessions': ('analysis_sessions_id_idx', 'ix_analysis_sessions_id'),
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table_name, duplicate_indexes in TABLES.items():
+        # Tables may not exist yet when the app has never started
+        if not inspector.has_table(table_name):
+            continue
+        # Primary keys already have a unique btree index
+        for index_name in duplicate_indexes:
+            op.execute(f"DROP INDEX IF EXISTS {index_name}")
+        op.alter_column(table_name, 'id', type_=sa.BigInteger(), existing_type=sa.Integer())
+        op.execute(f"ALTER SEQUENCE IF EXISTS {table_name}_id_seq AS bigint")
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table_name in TABLES:
+        if not inspector.has_table(table_name):
+            continue
+        op.execute(f"ALTER SEQUENCE IF EXISTS {table_name}_id_seq AS integer")
+        op.alter_column(table_name, 'id', type_=sa.Integer(), existing_type=sa.BigInteger())
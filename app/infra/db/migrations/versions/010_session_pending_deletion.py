@@ -0,0 +1,38 @@
+"""Staging table for batched user session cleanup
+
+Revision ID: 010_session_pending_deletion
+Revises: 009_review_bigint_ids
+Create Date: 2026-10-15 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_session_pending_deletion'
+down_revision = '009_review_bigint_ids'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Session tables are also created by metadata.create_all
+    if sa.inspect(op.get_bind()).has_table('user_sessions_pending_deletion'):
+        return
+    op.create_table(
+        'user_sessions_pending_deletion',
+        sa.Column('id', sa.BigInteger(), autoincrement=False, nullable=False,
+                  comment='user_sessions.id marked for deletion'),
+        sa.Column('marked_by', sa.Text(), nullable=False,
+                  comment='Cleanup run that marked the row'),
+        sa.Column('marked_at', sa.DateTime(timezone=True), nullable=False,
+                  server_default=sa.text('now()'), comment='Mark timestamp (UTC)'),
+        sa.PrimaryKeyConstraint('id', name='user_sessions_pending_deletion_pkey'),
+    )
+    op.create_index(
+        'idx_user_sessions_pending_marked_by', 'user_sessions_pending_deletion', ['marked_by']
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS user_sessions_pending_deletion")
@@ -0,0 +1,53 @@
+"""Index last task lookups by (user_id, type, start DESC, id DESC)
+
+Revision ID: 011_task_last_by_type_index
+Revises: 010_session_pending_deletion
+Create Date: 2026-10-15 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011_task_last_by_type_index'
+down_revision = '010_session_pending_deletion'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the replacement before dropping the old index, without blocking
+    # writes; CONCURRENTLY cannot run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_tasks_user_type_start_id',
+            'tasks',
+            ['user_id', 'type', sa.text('start DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_tasks_user_type_start',
+            table_name='tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_tasks_user_type_start',
+            'tasks',
+            ['user_id', 'type', sa.text('start DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_tasks_user_type_start_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,49 @@
+"""Native enums for task type, sentiment and error code
+
+Revision ID: 012_task_enum_columns
+Revises: 011_task_last_by_type_index
+Create Date: 2026-10-15 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '012_task_enum_columns'
+down_revision = '011_task_last_by_type_index'
+branch_labels = None
+depends_on = None
+
+# column -> (enum type, previous varchar length, nullable)
+ENUM_COLUMNS = {
+    'type': (postgresql.ENUM('single', 'batch', name='task_type'), 10, False),
+    'sentiment': (
+        postgresql.ENUM('positive', 'negative', 'neutral', name='task_sentiment'), 20, True
+    ),
+    'error_code': (postgresql.ENUM('01', '02', '03', name='task_error_code'), 5, True),
+}
+
+
+def upgrade() -> None:
+    # Store short enum strings as 4-byte native enums instead of varchar;
+    # indexes on these columns are rebuilt by the type change
+    for column, (enum_type, _, nullable) in ENUM_COLUMNS.items():
+        enum_type.create(op.get_bind(), checkfirst=True)
+        op.alter_column(
+            'tasks', column,
+            type_=enum_type,
+            existing_nullable=nullable,
+            postgresql_using=f'{column}::{enum_type.name}'
+        )
+
+
+def downgrade() -> None:
+    for column, (enum_type, length, nullable) in ENUM_COLUMNS.items():
+        op.alter_column(
+            'tasks', column,
+            type_=sa.String(length=length),
+            existing_nullable=nullable,
+            postgresql_using=f'{column}::text'
+        )
+        enum_type.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,32 @@
+"""Drop stored batch percentages, derived from the counts on read
+
+Revision ID: 013_drop_task_percentages
+Revises: 012_task_enum_columns
+Create Date: 2026-10-15 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013_drop_task_percentages'
+down_revision = '012_task_enum_columns'
+branch_labels = None
+depends_on = None
+
+SENTIMENTS = ('positive', 'negative', 'neutral')
+
+
+def upgrade() -> None:
+    for sentiment in SENTIMENTS:
+        op.drop_column('tasks', f'{sentiment}_percentage')
+
+
+def downgrade() -> None:
+    for sentiment in SENTIMENTS:
+        op.add_column('tasks', sa.Column(f'{sentiment}_percentage', sa.Float(), nullable=True))
+        op.execute(
+            f"UPDATE tasks SET {sentiment}_percentage = "
+            f"round({sentiment} * 100.0 / total_reviews, 1) "
+            "WHERE total_reviews > 0"
+        )
@@ -3,21 +3,192 @@ Repository pattern implementation for database operations.
 
 This module provides:
 - TaskRepository with async methods
+- TaskReadRepository returning plain Core rows for read-heavy paths
 - CRUD operations for tasks
 - User-specific task queries
 - Session management utilities
 """
 
+import itertools
+import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
-from sqlalchemy import desc, select, update, and_, func
+from sqlalchemy import (
+    BigInteger, DateTime, Row, Text, bindparam, delete, desc, exists, insert, select, tuple_,
+    update, func
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
+from app.core.config import settings
 from app.tasks.models import Task, TaskStatus, TaskType
-from app.infra.db.sessions import UserSession
+from app.infra.db.sessions import UserSession, UserSessionPendingDeletion
+
+
+# Fixed-shape statements built once at import; values are bound per call, so
+# every execution reuses the same statement object and its compiled form
+_GET_TASK_BY_TASK_ID = select(Task).where(Task.task_id == bindparam("task_id"))
+_GET_TASKS_BY_TASK_IDS = select(Task).where(Task.task_id.in_(bindparam("task_ids", expanding=True)))
+_GET_USER_TASK_BY_TASK_ID = select(Task).where(
+    Task.task_id == bindparam("task_id"), Task.user_id == bindparam("user_id")
+)
+_GET_LAST_USER_TASK = (
+    select(Task)
+    .where(Task.user_id == bindparam("user_id"), Task.type == bindparam("task_type"))
+    .order_by(desc(Task.start), desc(Task.id))
+    .limit(1)
+)
+# Listing queries refuse lazy relationship loads, so N+1 patterns fail loudly
+_GET_TASKS_BY_STATUS = (
+    select(Task)
+    .options(raiseload("*"))
+    .where(Task.status == bindparam("status"))
+    .order_by(Task.created_at)
+    .limit(bindparam("limit"))
+)
+_STREAM_TASKS_BY_STATUS = (
+    select(Task)
+    .options(raiseload("*"))
+    .where(Task.status == bindparam("status"))
+    .order_by(Task.created_at)
+)
+
+# get_user_tasks variants keyed by (filter by type, filter by status, after cursor);
+# pages are sought by (created_at, id) instead of skipping OFFSET rows. A cursor is
+# the (timezone-aware created_at, integer id) pair of the last task of a page; the
+# next page holds strictly older pairs, so tasks sharing created_at split on id
+_USER_TASKS = (
+    select(Task)
+    .options(raiseload("*"))
+    .where(Task.user_id == bindparam("user_id"))
+    .order_by(desc(Task.created_at), desc(Task.id))
+    .limit(bindparam("limit"))
+)
+
+
+def _user_tasks_stmt(base, by_type: bool, by_status: bool, after_cursor: bool):
+    """Build one get_user_tasks variant from a base listing statement."""
+    stmt = base
+    if by_type:
+        stmt = stmt.where(Task.type == bindparam("task_type"))
+    if by_status:
+        stmt = stmt.where(Task.status == bindparam("status"))
+    if after_cursor:
+        stmt = stmt.where(
+            tuple_(Task.created_at, Task.id)
+            < tuple_(
+                bindparam("cursor_created_at", type_=DateTime(timezone=True)),
+                bindparam("cursor_id", type_=BigInteger),
+            )
+        )
+    return stmt
+
+
+_GET_USER_TASKS = {
+    key: _user_tasks_stmt(_USER_TASKS, *key) for key in itertools.product((False, True), repeat=3)
+}
+
+# Core counterparts of the hot read queries: selecting table columns instead
+# of the entity yields plain rows, skipping ORM hydration and identity map
+_TASK_COLUMNS = tuple(Task.__table__.c)
+_CORE_GET_TASK_BY_TASK_ID = select(*_TASK_COLUMNS).where(Task.task_id == bindparam("task_id"))
+_CORE_GET_LAST_USER_TASK = (
+    select(*_TASK_COLUMNS)
+    .where(Task.user_id == bindparam("user_id"), Task.type == bindparam("task_type"))
+    .order_by(desc(Task.start), desc(Task.id))
+    .limit(1)
+)
+_CORE_USER_TASKS = (
+    select(*_TASK_COLUMNS)
+    .where(Task.user_id == bindparam("user_id"))
+    .order_by(desc(Task.created_at), desc(Task.id))
+    .limit(bindparam("limit"))
+)
+_CORE_GET_USER_TASKS = {
+    key: _user_tasks_stmt(_CORE_USER_TASKS, *key)
+    for key in itertools.product((False, True), repeat=3)
+}
+
+
+@lru_cache(maxsize=64)
+def _update_task_stmt(columns: FrozenSet[str], returning: bool = True):
+    """
+    Build (once per column set) an UPDATE of one task by primary key.
+    
+    The task ID is bound as ``task_pk`` and each new value as ``new_<column>``;
+    see TaskRepository._execute_update(). Bound values are invisible to the
+    ORM's in-Python session synchronization, so the caller applies them to an
+    already loaded instance itself.
+    """
+    stmt = (
+        update(Task)
+        .where(Task.id == bindparam("task_pk"))
+        .values({column: bindparam(f"new_{column}") for column in sorted(columns)})
+        .execution_options(synchronize_session=False)
+    )
+    return stmt.returning(Task) if returning else stmt
+
+
+_GET_SESSION_BY_SESSION_ID = select(UserSession).where(
+    UserSession.session_id == bindparam("session_id")
+)
+_GET_USER_SESSIONS = (
+    select(UserSession)
+    .options(raiseload("*"))
+    .where(UserSession.user_id == bindparam("user_id"))
+    .order_by(desc(UserSession.last_activity))
+    .limit(bindparam("limit"))
+)
+
+# Session cleanup through the pending-deletion staging table: mark a batch of
+# expired ids (skipping ones another run already marked), delete the marked
+# sessions, then clear the marks
+_EXPIRED_SESSION_IDS = (
+    select(UserSession.id, bindparam("marked_by", type_=Text))
+    .where(
+        UserSession.last_activity < bindparam("older_than"),
+        ~exists().where(UserSessionPendingDeletion.id == UserSession.id),
+    )
+    .order_by(UserSession.id)
+    .limit(bindparam("batch_size"))
+)
+# Table-level insert: the ORM insert path rejects the marked_at default added to FROM SELECT
+_MARK_EXPIRED_SESSIONS = {
+    dialect_name: (
+        dialect_insert(UserSessionPendingDeletion.__table__)
+        .from_select(["id", "marked_by"], _EXPIRED_SESSION_IDS)
+        .on_conflict_do_nothing(index_elements=["id"])
+    )
+    for dialect_name, dialect_insert in (("postgresql", pg_insert), ("sqlite", sqlite_insert))
+}
+_TAKE_OVER_STALE_MARKS = (
+    update(UserSessionPendingDeletion)
+    .where(UserSessionPendingDeletion.marked_at < bindparam("stale_before"))
+    .values(marked_by=bindparam("marked_by"), marked_at=func.now())
+    .execution_options(synchronize_session=False)
+)
+_DELETE_MARKED_SESSIONS = (
+    delete(UserSession)
+    .where(
+        UserSession.id.in_(
+            select(UserSessionPendingDeletion.id)
+            .where(UserSessionPendingDeletion.marked_by == bindparam("marked_by"))
+        )
+    )
+    .execution_options(synchronize_session=False)
+)
+_CLEAR_MARKS = (
+    delete(UserSessionPendingDeletion)
+    .where(UserSessionPendingDeletion.marked_by == bindparam("marked_by"))
+    .execution_options(synchronize_session=False)
+)
 
 
 class TaskRepository:
@@ -49,8 +220,6 @@ class TaskRepository:
         Returns:
             Created task instance
         """
-        import time
-        
         # Prepare task data
         task_data = {
             "type": task_type,
@@ -66,11 +235,9 @@ class TaskRepository:
             elif task_type == TaskType.batch and "file_path" in extra_data:
                 task_data["file_path"] = extra_data["file_path"]
         
-        task = Task(**task_data)
-        
-        self.session.add(task)
-        await self.session.flush()  # Get the ID without committing
-        return task
+        # Single INSERT ... RETURNING instead of add() + unit-of-work flush
+        result = await self.session.execute(insert(Task).values(**task_data).returning(Task))
+        return result.scalar_one()
     
     async def get_by_id(self, task_id: int) -> Optional[Task]:
         """
@@ -82,9 +249,8 @@ class TaskRepository:
         Returns:
             Task instance or None if not found
         """
-        stmt = select(Task).where(Task.id == task_id)
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        # Primary key lookup: served from the identity map when already loaded
+        return await self.session.get(Task, task_id)
     
     async def get_by_task_id(self, task_id: uuid.UUID) -> Optional[Task]:
         """
@@ -96,10 +262,27 @@ class TaskRepository:
         Returns:
             Task instance or None if not found
         """
-        stmt = select(Task).where(Task.task_id == task_id)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_GET_TASK_BY_TASK_ID, {"task_id": task_id})
         return result.scalar_one_or_none()
     
+    async def get_many_by_task_ids(self, task_ids: Sequence[uuid.UUID]) -> Dict[str, Task]:
+        """
+        Get several tasks by external task ID in one query (WHERE task_id IN ...).
+        
+        Args:
+            task_ids: External task UUIDs
+        
+        Returns:
+            Mapping of task_id to task; IDs that were not found are absent
+        """
+        if not task_ids:
+            return {}
+        
+        result = await self.session.execute(
+            _GET_TASKS_BY_TASK_IDS, {"task_ids": [str(task_id) for task_id in task_ids]}
+        )
+        return {task.task_id: task for task in result.scalars()}
+    
     async def get_user_task_by_id(self, task_id: uuid.UUID, user_id: str) -> Optional[Task]:
         """
         Get task by external task ID and verify it belongs to the user.
@@ -111,10 +294,9 @@ class TaskRepository:
         Returns:
             Task instance or None if not found or doesn't belong to user
         """
-        stmt = select(Task).where(
-            and_(Task.task_id == task_id, Task.user_id == user_id)
+        result = await self.session.execute(
+            _GET_USER_TASK_BY_TASK_ID, {"task_id": task_id, "user_id": user_id}
         )
-        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
     
     async def get_user_tasks(
@@ -123,37 +305,39 @@ class TaskRepository:
         task_type: Optional[TaskType] = None,
         status: Optional[TaskStatus] = None,
         limit: int = 10,
-        offset: int = 0,
-    ) -> List[Task]:
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> Tuple[List[Task], Optional[Tuple[datetime, int]]]:
         """
-        Get tasks for a specific user.
+        Get tasks for a specific user, newest first, using keyset pagination.
         
         Args:
             user_id: User identifier
             task_type: Filter by task type (optional)
             status: Filter by task status (optional)
             limit: Maximum number of tasks to return
-            offset: Number of tasks to skip
+            cursor: Next page cursor returned by the previous call: the
+                (timezone-aware created_at, id) of its last task (optional)
             
         Returns:
-            List of tasks
+            Tuple of (tasks, next page cursor or None when this is the last page)
         """
-        stmt = (
-            select(Task)
-            .where(Task.user_id == user_id)
-            .order_by(desc(Task.created_at))
-            .limit(limit)
-            .offset(offset)
-        )
+        params: Dict[str, Any] = {"user_id": user_id, "limit": limit}
         
         if task_type:
-            stmt = stmt.where(Task.type == task_type)
+            params["task_type"] = task_type
         
         if status:
-            stmt = stmt.where(Task.status == status)
+            params["status"] = status
         
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        if cursor is not None:
+            params["cursor_created_at"], params["cursor_id"] = cursor
+        
+        stmt = _GET_USER_TASKS[bool(task_type), bool(status), cursor is not None]
+        result = await self.session.execute(stmt, params)
+        tasks = result.scalars().all()
+        
+        next_cursor = (tasks[-1].created_at, tasks[-1].id) if len(tasks) == limit else None
+        return tasks, next_cursor
     
     async def get_last_user_task(
         self,
@@ -170,23 +354,17 @@ class TaskRepository:
         Returns:
             Most recent task or None if not found
         """
-        stmt = (
-            select(Task)
-            .where(Task.user_id == user_id)
-            .where(Task.type == task_type)
-            .order_by(desc(Task.start))
-            .limit(1)
+        result = await self.session.execute(
+            _GET_LAST_USER_TASK, {"user_id": user_id, "task_type": task_type}
         )
-        
-        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
     
     async def update_status(
         self,
         task_id: int,
         status: TaskStatus,
-        start_time: Optional[datetime] = None,
-        end_time: Optional[datetime] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
     ) -> Optional[Task]:
         """
         Update task status and timing.
@@ -194,28 +372,21 @@ class TaskRepository:
         Args:
             task_id: Internal task ID
             status: New task status
-            start_time: Task start time (optional)
-            end_time: Task end time (optional)
+            start: Task start as Unix timestamp (optional)
+            end: Task end as Unix timestamp (optional)
             
         Returns:
             Updated task instance or None if not found
         """
         update_data: Dict[str, Any] = {"status": status}
         
-        if start_time:
-            update_data["start_time"] = start_time
-        
-        if end_time:
-            update_data["end_time"] = end_time
+        if start is not None:
+            update_data["start"] = start
         
-        stmt = (
-            update(Task)
-            .where(Task.id == task_id)
-            .values(**update_data)
-            .returning(Task)
-        )
+        if end is not None:
+            update_data["end"] = end
         
-        result = await self.session.execute(stmt)
+        result = await self._execute_update(task_id, update_data)
         return result.scalar_one_or_none()
     
     async def update_result(
@@ -223,7 +394,7 @@ class TaskRepository:
         task_id: int,
         result: Dict[str, Any],
         status: TaskStatus = TaskStatus.ready,
-        end_time: Optional[datetime] = None,
+        end: Optional[int] = None,
     ) -> Optional[Task]:
         """
         Update task result and mark as completed.
@@ -232,7 +403,7 @@ class TaskRepository:
             task_id: Internal task ID
             result: Task result data
             status: Task status (default: READY)
-            end_time: Task completion time
+            end: Task completion as Unix timestamp (default: now)
             
         Returns:
             Updated task instance or None if not found
@@ -242,26 +413,16 @@ class TaskRepository:
             "status": status,
         }
         
-        if end_time:
-            update_data["end_time"] = end_time
-        else:
-            update_data["end_time"] = datetime.utcnow()
-        
-        stmt = (
-            update(Task)
-            .where(Task.id == task_id)
-            .values(**update_data)
-            .returning(Task)
-        )
+        update_data["end"] = end if end is not None else int(time.time())
         
-        result = await self.session.execute(stmt)
+        result = await self._execute_update(task_id, update_data)
         return result.scalar_one_or_none()
     
     async def update_error(
         self,
         task_id: int,
         error: Dict[str, Any],
-        end_time: Optional[datetime] = None,
+        end: Optional[int] = None,
     ) -> Optional[Task]:
         """
         Update task with error information.
@@ -269,7 +430,7 @@ class TaskRepository:
         Args:
             task_id: Internal task ID
             error: Error information
-            end_time: Task failure time
+            end: Task failure as Unix timestamp (default: now)
             
         Returns:
             Updated task instance or None if not found
@@ -279,19 +440,9 @@ class TaskRepository:
             "status": TaskStatus.error,
         }
         
-        if end_time:
-            update_data["end_time"] = end_time
-        else:
-            update_data["end_time"] = datetime.utcnow()
-        
-        stmt = (
-            update(Task)
-            .where(Task.id == task_id)
-            .values(**update_data)
-            .returning(Task)
-        )
+        update_data["end"] = end if end is not None else int(time.time())
         
-        result = await self.session.execute(stmt)
+        result = await self._execute_update(task_id, update_data)
         return result.scalar_one_or_none()
     
     async def update(
@@ -309,16 +460,50 @@ class TaskRepository:
         Returns:
             Updated task instance or None if not found
         """
-        stmt = (
-            update(Task)
-            .where(Task.id == task_id)
-            .values(**update_data)
-            .returning(Task)
-        )
-        
-        result = await self.session.execute(stmt)
+        result = await self._execute_update(task_id, update_data)
         return result.scalar_one_or_none()
     
+    async def update_fields(
+        self,
+        task_id: int,
+        fields: Dict[str, Any]
+    ) -> bool:
+        """
+        Update task columns without fetching the row back.
+        
+        For callers that only need to know whether the update happened
+        (e.g. background workers); use update() to get the fresh task.
+        
+        Args:
+            task_id: Internal task ID
+            fields: Column values to set
+        
+        Returns:
+            True if the task was updated, False if not found
+        """
+        result = await self._execute_update(task_id, fields, returning=False)
+        return result.rowcount > 0
+    
+    async def _execute_update(
+        self,
+        task_id: int,
+        values: Dict[str, Any],
+        returning: bool = True,
+    ):
+        """Run the cached UPDATE statement for this column set with the given values."""
+        params = {f"new_{column}": value for column, value in values.items()}
+        params["task_pk"] = task_id
+        result = await self.session.execute(_update_task_stmt(frozenset(values), returning), params)
+        
+        # Keep an already loaded instance in step with the database; RETURNING
+        # rows do not overwrite instances present in the identity map
+        task = self.session.identity_map.get(identity_key(Task, task_id))
+        if task is not None:
+            for column, value in values.items():
+                set_committed_value(task, column, value)
+        
+        return result
+    
     async def get_tasks_by_status(
         self,
         status: TaskStatus,
@@ -334,15 +519,104 @@ class TaskRepository:
         Returns:
             List of tasks with specified status
         """
-        stmt = (
-            select(Task)
+        result = await self.session.execute(
+            _GET_TASKS_BY_STATUS, {"status": status, "limit": limit}
+        )
+        return result.scalars().all()
+    
+    async def claim_tasks(
+        self,
+        status: TaskStatus,
+        new_status: TaskStatus,
+        limit: int = 100,
+    ) -> List[Task]:
+        """
+        Atomically move up to ``limit`` oldest tasks from one status to another.
+        
+        Candidate rows are locked with FOR UPDATE SKIP LOCKED and updated in
+        the same UPDATE ... RETURNING statement, so concurrent workers never
+        claim the same task and never wait on each other's locks.
+        
+        Args:
+            status: Status of tasks to claim
+            new_status: Status to set on claimed tasks
+            limit: Maximum number of tasks to claim
+        
+        Returns:
+            List of claimed tasks
+        """
+        candidates = (
+            select(Task.id)
             .where(Task.status == status)
             .order_by(Task.created_at)
             .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Task)
+            .where(Task.id.in_(candidates))
+            .values(status=new_status)
+            .returning(Task)
         )
         
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
+    
+    async def stream_tasks_by_status(
+        self,
+        status: TaskStatus,
+        chunk_size: int = 50,
+    ) -> AsyncIterator[Task]:
+        """
+        Stream tasks by status, oldest first, through a server-side cursor.
+        
+        Rows are fetched and hydrated ``chunk_size`` at a time, so a consumer
+        processing tasks one by one starts on the first chunk right away and
+        never holds the whole result set in memory.
+        
+        Args:
+            status: Task status to filter by
+            chunk_size: Number of rows fetched per round-trip
+        
+        Yields:
+            Tasks with specified status
+        """
+        result = await self.session.stream_scalars(
+            _STREAM_TASKS_BY_STATUS,
+            {"status": status},
+            execution_options={"yield_per": chunk_size},
+        )
+        async for task in result:
+            yield task
+    
+    async def count_user_tasks(
+        self,
+        user_id: str,
+        task_type: Optional[TaskType] = None,
+        status: Optional[TaskStatus] = None,
+    ) -> int:
+        """
+        Count user's tasks with SQL COUNT, optionally filtered by type and status.
+        
+        Args:
+            user_id: User identifier
+            task_type: Task type to count (optional)
+            status: Task status to count (optional)
+        
+        Returns:
+            Number of tasks
+        """
+        query = select(func.count(Task.id)).where(Task.user_id == user_id)
+        
+        if task_type:
+            query = query.where(Task.type == task_type)
+        
+        if status:
+            query = query.where(Task.status == status)
+        
+        result = await self.session.execute(query)
+        return result.scalar() or 0
     
     async def count_user_tasks_by_type(
         self,
@@ -359,14 +633,7 @@ class TaskRepository:
         Returns:
             Number of tasks
         """
-        query = select(func.count(Task.id)).where(
-            and_(
-                Task.user_id == user_id,
-                Task.type == task_type
-            )
-        )
-        result = await self.session.execute(query)
-        return result.scalar() or 0
+        return await self.count_user_tasks(user_id, task_type=task_type)
     
     async def count_user_tasks_by_status(
         self,
@@ -383,14 +650,99 @@ class TaskRepository:
         Returns:
             Number of tasks
         """
-        query = select(func.count(Task.id)).where(
-            and_(
-                Task.user_id == user_id,
-                Task.status == status
-            )
+        return await self.count_user_tasks(user_id, status=status)
+
+
+class TaskReadRepository:
+    """
+    Read-only Task queries returning Core rows instead of ORM instances.
+    
+    Rows expose the same attribute names as Task (row.status, row.task_id...)
+    but carry no instance state, so they suit read-heavy endpoints that only
+    serialize results. Use TaskRepository for anything that writes.
+    """
+    
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize repository with database session.
+        
+        Args:
+            session: Async database session
+        """
+        self.session = session
+    
+    async def get_by_task_id(self, task_id: str) -> Optional[Row]:
+        """
+        Get task row by external task ID.
+        
+        Args:
+            task_id: External task UUID
+        
+        Returns:
+            Task row or None if not found
+        """
+        result = await self.session.execute(_CORE_GET_TASK_BY_TASK_ID, {"task_id": task_id})
+        return result.one_or_none()
+    
+    async def get_last_user_task(
+        self,
+        user_id: str,
+        task_type: TaskType,
+    ) -> Optional[Row]:
+        """
+        Get the most recent task row for a user of a specific type.
+        
+        Args:
+            user_id: User identifier
+            task_type: Type of task to find
+        
+        Returns:
+            Most recent task row or None if not found
+        """
+        result = await self.session.execute(
+            _CORE_GET_LAST_USER_TASK, {"user_id": user_id, "task_type": task_type}
         )
-        result = await self.session.execute(query)
-        return result.scalar() or 0
+        return result.one_or_none()
+    
+    async def get_user_tasks(
+        self,
+        user_id: str,
+        task_type: Optional[TaskType] = None,
+        status: Optional[TaskStatus] = None,
+        limit: int = 10,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> Tuple[Sequence[Row], Optional[Tuple[datetime, int]]]:
+        """
+        Get task rows for a user, newest first, using keyset pagination.
+        
+        Args:
+            user_id: User identifier
+            task_type: Filter by task type (optional)
+            status: Filter by task status (optional)
+            limit: Maximum number of tasks to return
+            cursor: Next page cursor returned by the previous call: the
+                (timezone-aware created_at, id) of its last task (optional)
+        
+        Returns:
+            Tuple of (task rows, next page cursor or None when this is the last page)
+        """
+        params: Dict[str, Any] = {"user_id": user_id, "limit": limit}
+        
+        if task_type:
+            params["task_type"] = task_type
+        
+        if status:
+            params["status"] = status
+        
+        if cursor is not None:
+            params["cursor_created_at"], params["cursor_id"] = cursor
+        
+        stmt = _CORE_GET_USER_TASKS[bool(task_type), bool(status), cursor is not None]
+        result = await self.session.execute(stmt, params)
+        rows = result.all()
+        
+        next_cursor = (rows[-1].created_at, rows[-1].id) if len(rows) == limit else None
+        return rows, next_cursor
 
 
 class UserSessionRepository:
@@ -426,32 +778,49 @@ class UserSessionRepository:
         Returns:
             UserSession instance
         """
-        # Try to find existing session
-        stmt = select(UserSession).where(UserSession.session_id == session_id)
-        result = await self.session.execute(stmt)
-        user_session = result.scalar_one_or_none()
+        # Other fields are written only when provided
+        update_values: Dict[str, Any] = {"last_activity": func.now()}
+        if ip_address:
+            update_values["ip_address"] = ip_address
+        if user_agent:
+            update_values["user_agent"] = user_agent
+        if extra_data:
+            update_values["extra_data"] = extra_data
+        
+        # A bare activity refresh only writes once the stored timestamp is
+        # older than the refresh interval, not on every request
+        refresh_where = None
+        if len(update_values) == 1:
+            refresh_where = UserSession.last_activity < (
+                datetime.now(timezone.utc)
+                - timedelta(seconds=settings.session_activity_refresh_seconds)
+            )
         
-        if user_session:
-            # Update existing session
-            user_session.last_activity = datetime.utcnow()
-            if ip_address:
-                user_session.ip_address = ip_address
-            if user_agent:
-                user_session.user_agent = user_agent
-            if extra_data:
-                user_session.extra_data = extra_data
-        else:
-            # Create new session
-            user_session = UserSession(
+        # Single atomic INSERT ... ON CONFLICT DO UPDATE instead of SELECT + write
+        insert_stmt = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = (
+            insert_stmt(UserSession)
+            .values(
                 session_id=session_id,
                 user_id=user_id,
                 ip_address=ip_address,
                 user_agent=user_agent,
                 extra_data=extra_data or {},
             )
-            self.session.add(user_session)
+            .on_conflict_do_update(
+                index_elements=[UserSession.session_id],
+                set_=update_values,
+                where=refresh_where,
+            )
+            .returning(UserSession)
+            .execution_options(populate_existing=True)
+        )
         
-        await self.session.flush()
+        result = await self.session.execute(stmt)
+        user_session = result.scalar_one_or_none()
+        if user_session is None:
+            # Skipped refresh: the session exists and is recent enough
+            user_session = await self.get_by_session_id(session_id)
         return user_session
     
     async def get_by_session_id(self, session_id: str) -> Optional[UserSession]:
@@ -464,8 +833,7 @@ class UserSessionRepository:
         Returns:
             UserSession instance or None if not found
         """
-        stmt = select(UserSession).where(UserSession.session_id == session_id)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_GET_SESSION_BY_SESSION_ID, {"session_id": session_id})
         return result.scalar_one_or_none()
     
     async def get_user_sessions(
@@ -483,31 +851,64 @@ class UserSessionRepository:
         Returns:
             List of user sessions
         """
-        stmt = (
-            select(UserSession)
-            .where(UserSession.user_id == user_id)
-            .order_by(desc(UserSession.last_activity))
-            .limit(limit)
+        result = await self.session.execute(
+            _GET_USER_SESSIONS, {"user_id": user_id, "limit": limit}
         )
+        return result.scalars().all()
+    
+    async def take_over_stale_marks(self, marked_by: str, stale_before: datetime) -> int:
+        """
+        Re-mark sessions left pending by a cleanup run that did not finish.
         
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        Args:
+            marked_by: Marker of the current cleanup run
+            stale_before: Marks older than this are taken over
+        
+        Returns:
+            Number of sessions now marked by ``marked_by``
+        """
+        result = await self.session.execute(
+            _TAKE_OVER_STALE_MARKS, {"marked_by": marked_by, "stale_before": stale_before}
+        )
+        return result.rowcount or 0
     
-    async def cleanup_old_sessions(self, older_than: datetime) -> int:
+    async def mark_expired_sessions(
+        self,
+        marked_by: str,
+        older_than: datetime,
+        batch_size: int,
+    ) -> int:
+        """
+        Stage a batch of expired sessions in user_sessions_pending_deletion.
+        
+        Sessions already marked by another run are skipped, so concurrent
+        cleanup runs work on disjoint batches.
+        
+        Args:
+            marked_by: Marker of the current cleanup run
+            older_than: Cutoff datetime for last activity
+            batch_size: Maximum number of sessions to mark
+        
+        Returns:
+            Number of newly marked sessions
+        """
+        result = await self.session.execute(
+            _MARK_EXPIRED_SESSIONS[self.session.bind.dialect.name],
+            {"marked_by": marked_by, "older_than": older_than, "batch_size": batch_size},
+        )
+        return result.rowcount or 0
+    
+    async def delete_marked_sessions(self, marked_by: str) -> int:
         """
-        Remove sessions older than specified date.
+        Delete the sessions marked by a cleanup run and clear its marks.
         
         Args:
-            older_than: Cutoff datetime
+            marked_by: Marker of the current cleanup run
             
         Returns:
             Number of deleted sessions
         """
-        stmt = select(UserSession).where(UserSession.last_activity < older_than)
-        result = await self.session.execute(stmt)
-        sessions_to_delete = list(result.scalars().all())
-        
-        for session in sessions_to_delete:
-            await self.session.delete(session)
-        
-        return len(sessions_to_delete)
+        params = {"marked_by": marked_by}
+        result = await self.session.execute(_DELETE_MARKED_SESSIONS, params)
+        await self.session.execute(_CLEAR_MARKS, params)
+        return result.rowcount or 0
@@ -3,13 +3,15 @@ User session model for the Review Analysis API infrastructure.
 
 This module contains:
 - UserSession model for session tracking
+- UserSessionPendingDeletion staging table for batched session cleanup
 - Proper indexes and constraints for session management
 """
 
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from sqlalchemy import JSON, DateTime, Index, String, Text, func
+from sqlalchemy import JSON, BigInteger, DateTime, Index, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infra.db.base import Base
@@ -33,7 +35,7 @@ class UserSession(Base):
     __tablename__ = "user_sessions"
     
     # Primary key
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     
     # Session identification
     session_id: Mapped[str] = mapped_column(
@@ -81,15 +83,15 @@ class UserSession(Base):
     )
     
     extra_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(
-        JSON,
+        JSON().with_variant(JSONB(), "postgresql"),
         nullable=True,
         comment="Additional session metadata"
     )
     
     # Indexes for session queries
     __table_args__ = (
-        # Index for user session lookup
-        Index("idx_user_sessions_user_activity", "user_id", "last_activity"),
+        # Index for user session lookup, ordered like "latest sessions first"
+        Index("idx_user_sessions_user_activity", "user_id", text("last_activity DESC")),
         # Index for session cleanup
         Index("idx_user_sessions_created_at", "created_at"),
     )
@@ -100,3 +102,46 @@ class UserSession(Base):
             f"<UserSession(id={self.id}, session_id={self.session_id[:8]}..., "
             f"user_id={self.user_id[:8]}..., last_activity={self.last_activity})>"
         )
+
+
+class UserSessionPendingDeletion(Base):
+    """
+    Staging table for expired sessions awaiting deletion.
+    
+    Cleanup marks a small batch of expired session ids here and commits the
+    marks, then deletes the sessions and clears the marks in a second short
+    transaction. Marks left by a run that crashed in between are taken over
+    once they are older than the stale timeout.
+    
+    Attributes:
+        id: Primary key of the marked user_sessions row
+        marked_by: Identifier of the cleanup run that marked the row
+        marked_at: Time the row was marked
+    """
+    
+    __tablename__ = "user_sessions_pending_deletion"
+    
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=False,
+        comment="user_sessions.id marked for deletion"
+    )
+    
+    marked_by: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        comment="Cleanup run that marked the row"
+    )
+    
+    marked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=func.now(),
+        comment="Mark timestamp (UTC)"
+    )
+    
+    __table_args__ = (
+        # Index for per-run batch lookup
+        Index("idx_user_sessions_pending_marked_by", "marked_by"),
+    )
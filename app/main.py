@@ -5,9 +5,12 @@ Implements the API specification from api/openapi.yml.
 Task-based architecture for sentiment analysis.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.core.exceptions import (
@@ -28,7 +31,7 @@ from app.tasks.router import router as task_router
 from app.workers import start_mock_worker, stop_mock_worker
 
 # Configure logging first
-configure_logging()
+configure_logging(settings.log_level)
 logger = get_logger(__name__)
 
 
@@ -38,6 +41,13 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Review Analysis API", extra={"version": "1.0.0"})
     
+    # Bound the default executor used by asyncio.to_thread for blocking work
+    executor = ThreadPoolExecutor(
+        max_workers=settings.max_concurrent_tasks,
+        thread_name_prefix="blocking-io",
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+    
     # Initialize database
     try:
         await init_db(settings.database_url)
@@ -48,7 +58,6 @@ async def lifespan(app: FastAPI):
         # raise e  # Uncomment when database is required
     
     # Start mock worker for task processing
-    import asyncio
     worker_task = asyncio.create_task(start_mock_worker())
     logger.info("Mock worker started successfully")
     
@@ -80,8 +89,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error closing database connections: {e}")
     
+    executor.shutdown(wait=False, cancel_futures=True)
+    
     # TODO: Cleanup resources here:
-    # await app.state.db_engine.dispose()
     # await app.state.redis.close()
     # await app.state.ml_model.cleanup()
 
@@ -114,6 +124,7 @@ The system works with a task-based architecture:
         }
     ],
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Setup CORS using our security module
@@ -159,5 +170,8 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        workers=settings.workers,
+        loop="uvloop",
+        http="httptools",
         log_config=None,  # Use our custom logging
     )
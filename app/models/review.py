@@ -2,17 +2,20 @@
 SQLAlchemy models for the Smart Review Analyzer
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, Index, Text
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+# 64-bit surrogate keys; SQLite only autoincrements INTEGER PRIMARY KEY
+BIGINT_PK = BigInteger().with_variant(Integer, "sqlite")
+
 
 class Review(Base):
     """Review model for storing analyzed reviews."""
     
     __tablename__ = "reviews"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BIGINT_PK, primary_key=True)
     text = Column(Text, nullable=False, comment="Original review text")
     sentiment = Column(String(20), nullable=False, comment="Predicted sentiment: positive, negative, neutral")
     confidence = Column(Float, nullable=False, comment="Model confidence score (0-1)")
@@ -20,6 +23,11 @@ class Review(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="Timestamp when review was analyzed")
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), comment="Timestamp of last update")
     
+    __table_args__ = (
+        # Sentiment filters and GROUP BY sentiment, in id (insertion) order
+        Index("ix_reviews_sentiment_id", "sentiment", "id"),
+    )
+    
     def __repr__(self):
         return f"<Review(id={self.id}, sentiment='{self.sentiment}', confidence={self.confidence})>"
 
@@ -29,7 +37,7 @@ class AnalysisSession(Base):
     
     __tablename__ = "analysis_sessions"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BIGINT_PK, primary_key=True)
     filename = Column(String(255), nullable=True, comment="Original filename if uploaded from file")
     total_reviews = Column(Integer, nullable=False, default=0, comment="Total number of reviews in this session")
     positive_count = Column(Integer, nullable=False, default=0, comment="Number of positive reviews")
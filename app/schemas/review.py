@@ -2,7 +2,7 @@
 Pydantic schemas for review data validation
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional
 
@@ -21,16 +21,15 @@ class ReviewCreate(BaseModel):
 
 
 class ReviewResponse(BaseModel):
-    """Response schema for review data."""
+    """Response schema for review data, validated directly from ORM objects."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     text: str
     sentiment: str
     confidence: float
     created_at: datetime
     source: Optional[str] = None
-    
-    class Config:
-        from_attributes = True
 
 
 class ReviewUpdate(BaseModel):
@@ -1,20 +1,40 @@
 """
 Machine Learning service for sentiment analysis
+
+scikit-learn and NLTK are imported only when the model and stopwords are
+loaded (in a worker thread, see get_ml_service), not when this module is.
 """
 
+import asyncio
+import hashlib
+import logging
 import pickle
 import re
 import string
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
+import orjson
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
 
 from app.core.config import settings
+from app.core.exceptions import InternalServerError
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix for cached sentiment results
+SENTIMENT_CACHE_PREFIX = "sent:"
+
+# How long queued texts wait for concurrent requests to join a micro-batch
+MICRO_BATCH_WAIT_SECONDS = 0.005
+
+# Text preprocessing tables, built once instead of per text
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+WORD_PATTERN = re.compile(r'\w+')
+
+# Preprocessed texts kept per service; duplicate reviews skip preprocessing
+PREPROCESS_CACHE_SIZE = 10_000
 
 
 class MLService:
@@ -23,34 +43,39 @@ class MLService:
     def __init__(self):
         self.model = None
         self.vectorizer = None
-        self.lemmatizer = WordNetLemmatizer()
+        # Micro-batching state for concurrent async callers
+        self._inference_semaphore = asyncio.Semaphore(1)
+        self._pending: List[tuple[str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # NLTK data must be present before preprocessing (the demo model uses it)
+        self._stop_words = self._load_stop_words()
+        self._preprocess_text = lru_cache(maxsize=PREPROCESS_CACHE_SIZE)(self._preprocess_text)
         self._load_model()
-        self._download_nltk_data()
+        self._prepare_scoring()
     
-    def _download_nltk_data(self):
-        """Download required NLTK data."""
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
+    def _load_stop_words(self) -> frozenset:
+        """
+        Load English stopwords from NLTK data.
+        
+        The corpus is installed at image build time (see Dockerfile.backend);
+        it is downloaded only as a fallback when missing, e.g. in local runs.
+        """
+        import nltk
+        from nltk.corpus import stopwords
         
         try:
-            nltk.data.find('corpora/stopwords')
+            return frozenset(stopwords.words('english'))
         except LookupError:
             nltk.download('stopwords')
-            
-        try:
-            nltk.data.find('corpora/wordnet')
-        except LookupError:
-            nltk.download('wordnet')
+            return frozenset(stopwords.words('english'))
     
     def _load_model(self):
         """Load the trained model and vectorizer."""
         try:
-            with open(settings.MODEL_PATH, 'rb') as f:
+            with open(settings.model_path, 'rb') as f:
                 self.model = pickle.load(f)
             
-            with open(settings.VECTORIZER_PATH, 'rb') as f:
+            with open(settings.vectorizer_path, 'rb') as f:
                 self.vectorizer = pickle.load(f)
                 
         except FileNotFoundError:
@@ -60,7 +85,10 @@ class MLService:
     def _create_demo_model(self):
         """Create a simple demo model for testing purposes."""
         # This is a placeholder - in production, you'd train on real data
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        
+        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english', dtype=np.float32)
         self.model = LogisticRegression()
         
         # Demo training data
@@ -82,23 +110,71 @@ class MLService:
         X = self.vectorizer.fit_transform(processed_texts)
         self.model.fit(X, demo_labels)
     
+    def _prepare_scoring(self):
+        """
+        Precompute dense linear-model weights for the fast scoring path.
+        
+        For multinomial logistic regression, probabilities are softmax(X @ W + b),
+        so scoring can skip sklearn's per-call input validation. Weights are
+        kept in float32, halving memory traffic in the sparse matmul. One-vs-rest
+        models keep using predict_proba.
+        
+        A binary multinomial model has a single coefficient row; sklearn scores
+        its two classes as [-d, d], so the row is mirrored into two columns.
+        """
+        # Same check as sklearn's predict_proba; "deprecated" is the
+        # auto-detecting default from scikit-learn 1.5 on
+        multi_class = getattr(self.model, "multi_class", "auto")
+        is_ovr = multi_class in ("ovr", "warn") or (
+            multi_class in ("auto", "deprecated")
+            and (self.model.classes_.size <= 2 or self.model.solver == "liblinear")
+        )
+        
+        coef = self.model.coef_
+        intercept = self.model.intercept_
+        if not is_ovr and coef.shape[0] == 1 and self.model.classes_.size == 2:
+            coef = np.vstack([-coef, coef])
+            intercept = np.concatenate([-intercept, intercept])
+        
+        if is_ovr or coef.shape[0] != self.model.classes_.size:
+            self._weights = None
+            self._intercept = None
+        else:
+            self._weights = np.ascontiguousarray(coef.T, dtype=np.float32)
+            self._intercept = intercept.astype(np.float32)
+    
+    def _predict_proba(self, text_vectors) -> np.ndarray:
+        """Compute class probabilities for vectorized texts."""
+        if self._weights is None:
+            return self.model.predict_proba(text_vectors)
+        
+        # Vectorizers pickled before float32 output still produce float64
+        if text_vectors.dtype != np.float32:
+            text_vectors = text_vectors.astype(np.float32)
+        
+        # Numerically stable softmax over the linear scores
+        scores = text_vectors @ self._weights + self._intercept
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+    
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text for analysis."""
         # Convert to lowercase
         text = text.lower()
         
         # Remove punctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
+        text = text.translate(PUNCTUATION_TABLE)
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Tokenize (punctuation is gone, so word runs are the tokens;
+        # whitespace of any length separates them)
+        tokens = WORD_PATTERN.findall(text)
         
-        # Tokenize
-        tokens = word_tokenize(text)
-        
-        # Remove stopwords and lemmatize
-        stop_words = set(stopwords.words('english'))
-        tokens = [self.lemmatizer.lemmatize(token) for token in tokens if token not in stop_words]
+        # Remove stopwords (no lemmatization: scripts/train_model.py trains
+        # without it, and WordNet lookups dominated per-token cost)
+        stop_words = self._stop_words
+        tokens = [token for token in tokens if token not in stop_words]
         
         return ' '.join(tokens)
     
@@ -118,10 +194,99 @@ class MLService:
         # Vectorize
         text_vector = self.vectorizer.transform([processed_text])
         
-        # Predict
-        prediction = self.model.predict(text_vector)[0]
-        probabilities = self.model.predict_proba(text_vector)[0]
+        # Predict once; the predicted class is the most probable one
+        probabilities = self._predict_proba(text_vector)[0]
+        prediction = self.model.classes_[np.argmax(probabilities)]
+        
+        return self._build_result(prediction, probabilities)
+    
+    async def analyze_sentiment_cached(self, text: str, redis: aioredis.Redis) -> Dict[str, any]:
+        """
+        Analyze sentiment of a text, reusing cached results for identical texts.
+        
+        Results are stored in Redis under the SHA-256 of the text for
+        ``settings.sentiment_cache_ttl_seconds``. Cache errors fall back to
+        inference.
+        
+        Args:
+            text: Text to analyze
+            redis: Async Redis client
+            
+        Returns:
+            Dictionary with sentiment and confidence
+        """
+        key = SENTIMENT_CACHE_PREFIX + hashlib.sha256(text.encode("utf-8")).hexdigest()
+        
+        try:
+            cached = await redis.get(key)
+        except RedisError as e:
+            logger.warning(f"Sentiment cache lookup failed: {e}")
+            cached = None
+        
+        if cached is not None:
+            return orjson.loads(cached)
+        
+        result = await self.analyze_sentiment_async(text)
+        
+        try:
+            await redis.setex(key, settings.sentiment_cache_ttl_seconds, orjson.dumps(result))
+        except RedisError as e:
+            logger.warning(f"Sentiment cache store failed: {e}")
+        
+        return result
+    
+    async def analyze_sentiment_async(self, text: str) -> Dict[str, any]:
+        """
+        Analyze sentiment of a text from async code.
+        
+        Concurrent calls are coalesced into micro-batches that run one at a
+        time in a worker thread, so inference never oversubscribes the CPU
+        and the event loop is never blocked.
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Dictionary with sentiment and confidence
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_pending())
         
+        return await future
+    
+    async def _flush_pending(self):
+        """Run queued texts through the model in batches until the queue is empty."""
+        while self._pending:
+            # Give concurrent requests a moment to join the batch
+            await asyncio.sleep(MICRO_BATCH_WAIT_SECONDS)
+            
+            batch = self._pending[:settings.batch_size]
+            del self._pending[:len(batch)]
+            
+            async with self._inference_semaphore:
+                try:
+                    results = await asyncio.to_thread(
+                        self.analyze_sentiment_batch, [text for text, _ in batch]
+                    )
+                except Exception as e:
+                    # One exception per caller: a shared instance would collect
+                    # every awaiter's traceback as each of them re-raises it
+                    for _, future in batch:
+                        if not future.done():
+                            error = InternalServerError("Sentiment analysis failed")
+                            error.__cause__ = e
+                            future.set_exception(error)
+                    continue
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+    
+    def _build_result(self, prediction: int, probabilities: np.ndarray) -> Dict[str, any]:
+        """Build sentiment result dictionary from model output."""
         # Map prediction to sentiment
         sentiment_map = {0: "negative", 1: "positive", 2: "neutral"}
         sentiment = sentiment_map[prediction]
@@ -149,9 +314,64 @@ class MLService:
         Returns:
             List of sentiment analysis results
         """
+        return self.analyze_sentiment_batch(texts)
+    
+    def analyze_sentiment_batch(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, any]]:
+        """
+        Analyze sentiment for multiple texts with vectorized inference.
+        
+        Texts are vectorized and scored in chunks of ``batch_size``, so the
+        model runs once per chunk instead of once per text.
+        
+        Args:
+            texts: List of texts to analyze
+            batch_size: Number of texts per model call (defaults to settings.batch_size)
+            
+        Returns:
+            List of sentiment analysis results in the same order as ``texts``
+        """
+        batch_size = batch_size or settings.batch_size
         results = []
-        for text in texts:
-            result = self.analyze_sentiment(text)
-            results.append(result)
+        
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            
+            # Preprocess and vectorize the whole chunk at once
+            processed_texts = [self._preprocess_text(text) for text in chunk]
+            text_vectors = self.vectorizer.transform(processed_texts)
+            
+            # Single predict_proba call per chunk; prediction is the argmax class
+            probabilities = self._predict_proba(text_vectors)
+            predictions = self.model.classes_[np.argmax(probabilities, axis=1)]
+            
+            results.extend(
+                self._build_result(prediction, row)
+                for prediction, row in zip(predictions, probabilities)
+            )
         
         return results
+
+
+# Global ML service instance
+_ml_service: Optional[MLService] = None
+_ml_service_lock = asyncio.Lock()
+
+
+async def get_ml_service() -> MLService:
+    """
+    Get the process-wide ML service instance, loading the model on first use.
+    
+    The first call (made from the app lifespan) loads the model in a worker
+    thread, so unpickling or demo training never blocks the event loop, and
+    concurrent first callers share that single load.
+    """
+    global _ml_service
+    if _ml_service is None:
+        async with _ml_service_lock:
+            if _ml_service is None:
+                _ml_service = await asyncio.to_thread(MLService)
+    return _ml_service
@@ -2,19 +2,36 @@
 Review service for database operations
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import itertools
+import time
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.review import Review, AnalysisSession
 from app.schemas.review import ReviewCreate, ReviewUpdate
 
+# Sentiment statistics are a full-table aggregate that changes slowly, so the
+# result is reused for a few seconds; local writes invalidate it immediately
+STATISTICS_CACHE_TTL = 30.0
+
+# Rows per executemany round when streaming reviews in without RETURNING
+BULK_INSERT_CHUNK_SIZE = 1000
+_statistics_cache: Optional[Tuple[float, dict]] = None
+
+
+def invalidate_statistics_cache() -> None:
+    """Drop the cached sentiment statistics of this process."""
+    global _statistics_cache
+    _statistics_cache = None
+
 
 class ReviewService:
     """Service for review-related database operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def create_review(self, review_data: ReviewCreate) -> Review:
+    async def create_review(self, review_data: ReviewCreate) -> Review:
         """Create a new review in the database."""
         db_review = Review(
             text=review_data.text,
@@ -23,66 +40,179 @@ class ReviewService:
             source=review_data.source
         )
         self.db.add(db_review)
-        self.db.commit()
-        self.db.refresh(db_review)
+        await self.db.commit()
+        invalidate_statistics_cache()
+        await self.db.refresh(db_review)
         return db_review
     
-    def get_review(self, review_id: int) -> Optional[Review]:
+    async def bulk_create_reviews(self, reviews_data: List[ReviewCreate]) -> List[Review]:
+        """Create many reviews with a single INSERT ... RETURNING and one commit."""
+        if not reviews_data:
+            return []
+        
+        result = await self.db.scalars(
+            insert(Review).returning(Review),
+            [review_data.model_dump() for review_data in reviews_data]
+        )
+        reviews = result.all()
+        await self.db.commit()
+        invalidate_statistics_cache()
+        return reviews
+    
+    async def create_reviews_bulk(
+        self,
+        reviews_data: Iterable[ReviewCreate],
+        chunk_size: int = BULK_INSERT_CHUNK_SIZE
+    ) -> int:
+        """
+        Insert reviews from an iterable (e.g. a parsed batch file) in one transaction.
+        
+        Unlike bulk_create_reviews, no ORM objects are built or returned: the
+        input is consumed in chunks of ``chunk_size`` plain mappings, each sent
+        as a single Core executemany, so memory stays bounded for large files.
+        
+        Args:
+            reviews_data: Reviews to insert
+            chunk_size: Number of rows per INSERT round
+        
+        Returns:
+            Number of inserted reviews
+        """
+        reviews_iter = iter(reviews_data)
+        inserted = 0
+        
+        while chunk := [
+            review_data.model_dump()
+            for review_data in itertools.islice(reviews_iter, chunk_size)
+        ]:
+            await self.db.execute(insert(Review.__table__), chunk)
+            inserted += len(chunk)
+        
+        if inserted:
+            await self.db.commit()
+            invalidate_statistics_cache()
+        return inserted
+    
+    async def get_review(self, review_id: int) -> Optional[Review]:
         """Get a review by ID."""
-        return self.db.query(Review).filter(Review.id == review_id).first()
+        result = await self.db.execute(select(Review).where(Review.id == review_id))
+        return result.scalar_one_or_none()
     
-    def get_reviews(self, skip: int = 0, limit: int = 100) -> List[Review]:
-        """Get a list of reviews with pagination."""
-        return self.db.query(Review).offset(skip).limit(limit).all()
+    async def get_reviews(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[int] = None
+    ) -> List[Review]:
+        """
+        Get a list of reviews with pagination.
+        
+        When ``cursor`` is given, keyset pagination is used instead of OFFSET:
+        returns reviews with ``id < cursor`` newest first, so the next page
+        cursor is the id of the last returned review.
+        """
+        if cursor is not None:
+            stmt = (
+                select(Review)
+                .where(Review.id < cursor)
+                .order_by(Review.id.desc())
+                .limit(limit)
+            )
+        else:
+            stmt = select(Review).offset(skip).limit(limit)
+        
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
     
-    def update_review(self, review_id: int, review_data: ReviewUpdate) -> Optional[Review]:
-        """Update a review."""
-        db_review = self.get_review(review_id)
-        if db_review:
-            for field, value in review_data.dict(exclude_unset=True).items():
-                setattr(db_review, field, value)
-            self.db.commit()
-            self.db.refresh(db_review)
+    async def update_review(self, review_id: int, review_data: ReviewUpdate) -> Optional[Review]:
+        """Update a review with a single UPDATE ... RETURNING."""
+        values = review_data.model_dump(exclude_unset=True)
+        if not values:
+            return await self.get_review(review_id)
+        
+        result = await self.db.execute(
+            update(Review).where(Review.id == review_id).values(**values).returning(Review)
+        )
+        db_review = result.scalar_one_or_none()
+        await self.db.commit()
+        invalidate_statistics_cache()
         return db_review
     
-    def delete_review(self, review_id: int) -> bool:
-        """Delete a review."""
-        db_review = self.get_review(review_id)
-        if db_review:
-            self.db.delete(db_review)
-            self.db.commit()
-            return True
-        return False
+    async def delete_review(self, review_id: int) -> bool:
+        """Delete a review with a single DELETE (no prior SELECT)."""
+        result = await self.db.execute(delete(Review).where(Review.id == review_id))
+        await self.db.commit()
+        invalidate_statistics_cache()
+        return result.rowcount > 0
     
-    def get_reviews_by_sentiment(self, sentiment: str) -> List[Review]:
+    async def get_reviews_by_sentiment(self, sentiment: str) -> List[Review]:
         """Get reviews filtered by sentiment."""
-        return self.db.query(Review).filter(Review.sentiment == sentiment).all()
+        result = await self.db.execute(select(Review).where(Review.sentiment == sentiment))
+        return result.scalars().all()
     
-    def get_sentiment_statistics(self) -> dict:
-        """Get overall sentiment statistics."""
-        total_reviews = self.db.query(Review).count()
-        
-        if total_reviews == 0:
-            return {
-                "total_reviews": 0,
-                "positive": 0,
-                "negative": 0,
-                "neutral": 0,
-                "positive_percentage": 0,
-                "negative_percentage": 0,
-                "neutral_percentage": 0
-            }
-        
-        positive_count = self.db.query(Review).filter(Review.sentiment == "positive").count()
-        negative_count = self.db.query(Review).filter(Review.sentiment == "negative").count()
-        neutral_count = self.db.query(Review).filter(Review.sentiment == "neutral").count()
-        
-        return {
-            "total_reviews": total_reviews,
-            "positive": positive_count,
-            "negative": negative_count,
-            "neutral": neutral_count,
-            "positive_percentage": round((positive_count / total_reviews) * 100, 2),
-            "negative_percentage": round((negative_count / total_reviews) * 100, 2),
-            "neutral_percentage": round((neutral_count / total_reviews) * 100, 2)
+    async def get_review_summaries_by_sentiment(
+        self, sentiment: str, max_chars: int = 100
+    ) -> List[dict]:
+        """
+        Get review summaries filtered by sentiment with text truncated in SQL.
+        
+        Only the first ``max_chars`` characters of each text are sent over the
+        wire; ``is_truncated`` tells whether the stored text is longer.
+        """
+        stmt = (
+            select(
+                Review.id,
+                func.substr(Review.text, 1, max_chars).label("text"),
+                (func.length(Review.text) > max_chars).label("is_truncated"),
+                Review.confidence,
+                Review.created_at,
+            )
+            .where(Review.sentiment == sentiment)
+        )
+        result = await self.db.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+    
+    async def get_sentiment_statistics(self) -> dict:
+        """
+        Get overall sentiment statistics.
+        
+        Counts, percentages and the dominant sentiment are computed by a single
+        GROUP BY query; only one row per sentiment is returned to Python.
+        The result is cached per process for ``STATISTICS_CACHE_TTL`` seconds
+        and dropped on every review write made through this service.
+        """
+        global _statistics_cache
+        
+        if _statistics_cache is not None and _statistics_cache[0] > time.monotonic():
+            return dict(_statistics_cache[1])
+        
+        review_count = func.count()
+        stmt = (
+            select(
+                Review.sentiment,
+                review_count.label("count"),
+                (review_count * 100.0 / func.sum(review_count).over()).label("percentage"),
+            )
+            .group_by(Review.sentiment)
+            .order_by(review_count.desc())
+        )
+        rows = (await self.db.execute(stmt)).all()
+        
+        statistics = {
+            "total_reviews": sum(row.count for row in rows),
+            "positive": 0,
+            "negative": 0,
+            "neutral": 0,
+            "positive_percentage": 0,
+            "negative_percentage": 0,
+            "neutral_percentage": 0,
+            "dominant_sentiment": rows[0].sentiment if rows else None
         }
+        
+        for row in rows:
+            if row.sentiment in ("positive", "negative", "neutral"):
+                statistics[row.sentiment] = row.count
+                statistics[f"{row.sentiment}_percentage"] = round(float(row.percentage), 2)
+        
+        _statistics_cache = (time.monotonic() + STATISTICS_CACHE_TTL, statistics)
+        return dict(statistics)
@@ -14,8 +14,8 @@ from typing import Optional
 from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.db.dependencies import get_db_session, get_task_repository
-from app.infra.db.repo import TaskRepository
+from app.infra.db.dependencies import get_db_session, get_read_task_repository, get_task_repository
+from app.infra.db.repo import TaskReadRepository, TaskRepository
 from app.tasks.service import TaskService
 
 
@@ -27,6 +27,21 @@ async def get_task_service(
     
     Args:
         task_repo: Task repository from dependency
+    
+    Returns:
+        TaskService instance
+    """
+    return TaskService(task_repo)
+
+
+async def get_read_task_service(
+    task_repo: TaskReadRepository = Depends(get_read_task_repository)
+) -> TaskService:
+    """
+    Get task service instance for read-only endpoints (no commit).
+    
+    Args:
+        task_repo: Core-row task repository bound to a read-only session
         
     Returns:
         TaskService instance
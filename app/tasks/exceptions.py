@@ -7,7 +7,7 @@ This module contains:
 - Error code mapping ("01", "02", "03")
 """
 
-from typing import Optional
+from typing import Any, Optional, Tuple
 from enum import Enum
 
 from app.core.exceptions import BaseAppException
@@ -20,21 +20,46 @@ class ErrorCode(str, Enum):
     SYSTEM_ERROR = "03"          # System/infrastructure error
 
 class TaskException(BaseAppException):
-    """Base exception for task-related errors."""
+    """
+    Base exception for task-related errors.
+    
+    Subclasses pass their raw values as ``details_args``, matched by position
+    to ``detail_keys``; the ``details`` dict is built only when first read
+    (e.g. by the exception handler), not for errors caught internally.
+    """
+    
+    # Keys of the lazily built details dict, in ``details_args`` order
+    detail_keys: Tuple[str, ...] = ()
     
     def __init__(
         self,
         message: str,
         error_code: Optional[ErrorCode] = None,
         details: Optional[dict] = None,
+        details_args: Tuple[Any, ...] = (),
     ) -> None:
+        self._details_args = details_args
         super().__init__(message, details)
         self.error_code = error_code or ErrorCode.SYSTEM_ERROR
+    
+    @property
+    def details(self) -> dict:
+        """Error details, built from ``details_args`` on first access."""
+        if self._details is None:
+            self._details = dict(zip(self.detail_keys, self._details_args))
+        return self._details
+    
+    @details.setter
+    def details(self, value: dict) -> None:
+        # An empty dict from BaseAppException means "build from details_args"
+        self._details = value or None
 
 
 class TaskNotFound(TaskException):
     """Raised when a task is not found."""
     
+    detail_keys = ("task_id", "task_type")
+    
     def __init__(self, task_id: str, task_type: Optional[str] = None) -> None:
         message = f"Task not found: {task_id}"
         if task_type:
@@ -43,7 +68,7 @@ class TaskNotFound(TaskException):
         super().__init__(
             message=message,
             error_code=ErrorCode.INVALID_INPUT,
-            details={"task_id": task_id, "task_type": task_type}
+            details_args=(task_id, task_type)
         )
         # Override status code to 404 for not found errors
         self.status_code = 404
@@ -52,36 +77,39 @@ class TaskNotFound(TaskException):
 class InvalidTaskStatus(TaskException):
     """Raised when task status transition is invalid."""
     
+    detail_keys = ("current_status", "requested_status")
+    
     def __init__(self, current_status: str, requested_status: str) -> None:
         super().__init__(
             message=f"Invalid status transition from {current_status} to {requested_status}",
             error_code=ErrorCode.INVALID_INPUT,
-            details={
-                "current_status": current_status,
-                "requested_status": requested_status
-            }
+            details_args=(current_status, requested_status)
         )
 
 
 class FileProcessingError(TaskException):
     """Raised when file processing fails."""
     
+    detail_keys = ("filename", "reason")
+    
     def __init__(self, filename: str, reason: str) -> None:
         super().__init__(
             message=f"Failed to process file {filename}: {reason}",
             error_code=ErrorCode.PROCESSING_ERROR,
-            details={"filename": filename, "reason": reason}
+            details_args=(filename, reason)
         )
 
 
 class UnsupportedFormat(TaskException):
     """Raised when file format is not supported."""
     
+    detail_keys = ("filename", "format")
+    
     def __init__(self, filename: str, format_type: str) -> None:
         super().__init__(
             message=f"Unsupported file format: {format_type} for file {filename}",
             error_code=ErrorCode.INVALID_INPUT,
-            details={"filename": filename, "format": format_type}
+            details_args=(filename, format_type)
         )
         # Override status code to 415 for unsupported media type
         self.status_code = 415
@@ -90,26 +118,26 @@ class UnsupportedFormat(TaskException):
 class TextTooLong(TaskException):
     """Raised when input text exceeds maximum length."""
     
+    detail_keys = ("text_length", "max_length")
+    
     def __init__(self, text_length: int, max_length: int) -> None:
         super().__init__(
             message=f"Text length {text_length} exceeds maximum {max_length} characters",
             error_code=ErrorCode.INVALID_INPUT,
-            details={"text_length": text_length, "max_length": max_length}
+            details_args=(text_length, max_length)
         )
 
 
 class FileTooLarge(TaskException):
     """Raised when uploaded file exceeds size limit."""
     
+    detail_keys = ("filename", "file_size", "max_size")
+    
     def __init__(self, file_size: int, max_size: int, filename: str) -> None:
         super().__init__(
             message=f"File size exceeds the maximum limit of 10MB.",
             error_code=ErrorCode.INVALID_INPUT,
-            details={
-                "filename": filename,
-                "file_size": file_size,
-                "max_size": max_size
-            }
+            details_args=(filename, file_size, max_size)
         )
         # Override status code to 413 for payload too large
         self.status_code = 413
@@ -118,9 +146,11 @@ class FileTooLarge(TaskException):
 class TaskProcessingTimeout(TaskException):
     """Raised when task processing times out."""
     
+    detail_keys = ("task_id", "timeout_seconds")
+    
     def __init__(self, task_id: str, timeout_seconds: int) -> None:
         super().__init__(
             message=f"Task {task_id} processing timed out after {timeout_seconds} seconds",
             error_code=ErrorCode.PROCESSING_ERROR,
-            details={"task_id": task_id, "timeout_seconds": timeout_seconds}
+            details_args=(task_id, timeout_seconds)
         )
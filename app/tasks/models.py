@@ -6,7 +6,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import DateTime, Index, String, Text, func, Integer, Float
+from sqlalchemy import (
+    BigInteger, DateTime, Enum as SAEnum, Index, String, Text, func, Integer, Float,
+    text as sa_text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infra.db.base import Base
@@ -40,6 +43,11 @@ class TaskErrorCode(str, Enum):
     code_03 = "03"
 
 
+def _enum_values(enum_cls: type[Enum]) -> list[str]:
+    """Persist enum values (e.g. "01") rather than member names (code_01)."""
+    return [member.value for member in enum_cls]
+
+
 class Task(Base):
     """
     Task model for storing analysis tasks and results according to OpenAPI spec.
@@ -47,7 +55,7 @@ class Task(Base):
     __tablename__ = "tasks"
     
     # Primary key
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     
     # Task identification (UUID as string for API compatibility)
     task_id: Mapped[str] = mapped_column(
@@ -59,15 +67,18 @@ class Task(Base):
         comment="Unique task identifier"
     )
     
-    # Task properties
+    # Task properties. Enum columns are native PG enums: stored in 4 bytes and
+    # compared by sort order like an integer; SQLAlchemy maps values through
+    # prebuilt lookup tables, so a SmallInteger column with manual decoding
+    # would gain nothing
     type: Mapped[TaskType] = mapped_column(
-        String(10),
+        SAEnum(TaskType, name="task_type", values_callable=_enum_values),
         nullable=False,
         comment="Task type: single or batch"
     )
     
     status: Mapped[TaskStatus] = mapped_column(
-        String(20),
+        SAEnum(TaskStatus, name="task_status"),
         nullable=False,
         default=TaskStatus.accepted,
         index=True,
@@ -82,15 +93,15 @@ class Task(Base):
         comment="User identifier from cookies"
     )
     
-    # Timestamps as Unix timestamps for API compatibility
+    # Timestamps as Unix timestamps for API compatibility (BIGINT: past 2038)
     start: Mapped[int] = mapped_column(
-        Integer,
+        BigInteger,
         nullable=False,
         comment="Unix timestamp of task start"
     )
     
     end: Mapped[Optional[int]] = mapped_column(
-        Integer,
+        BigInteger,
         nullable=True,
         comment="Unix timestamp of task completion"
     )
@@ -110,7 +121,7 @@ class Task(Base):
     
     # Single analysis results
     sentiment: Mapped[Optional[SentimentEnum]] = mapped_column(
-        String(20),
+        SAEnum(SentimentEnum, name="task_sentiment", values_callable=_enum_values),
         nullable=True,
         comment="Sentiment analysis result"
     )
@@ -146,27 +157,9 @@ class Task(Base):
         comment="Number of neutral reviews"
     )
     
-    positive_percentage: Mapped[Optional[float]] = mapped_column(
-        Float,
-        nullable=True,
-        comment="Percentage of positive reviews"
-    )
-    
-    negative_percentage: Mapped[Optional[float]] = mapped_column(
-        Float,
-        nullable=True,
-        comment="Percentage of negative reviews"
-    )
-    
-    neutral_percentage: Mapped[Optional[float]] = mapped_column(
-        Float,
-        nullable=True,
-        comment="Percentage of neutral reviews"
-    )
-    
     # Error information
     error_code: Mapped[Optional[TaskErrorCode]] = mapped_column(
-        String(5),
+        SAEnum(TaskErrorCode, name="task_error_code", values_callable=_enum_values),
         nullable=True,
         comment="Error code if task failed"
     )
@@ -181,14 +174,14 @@ class Task(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=func.now(),
+        server_default=func.now(),
         comment="Task creation timestamp (UTC)"
     )
     
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=func.now(),
+        server_default=func.now(),
         onupdate=func.now(),
         comment="Last update timestamp (UTC)"
     )
@@ -197,7 +190,26 @@ class Task(Base):
     __table_args__ = (
         Index("idx_tasks_user_type_status", "user_id", "type", "status"),
         Index("idx_tasks_created_at", "created_at"),
-        Index("idx_tasks_status_updated", "status", "updated_at"),
+        # Composite indexes matching the repository's filter + ORDER BY shapes,
+        # so listings are read in index order instead of sorted in memory
+        Index("idx_tasks_user_created", "user_id", sa_text("created_at DESC"), sa_text("id DESC")),
+        # Last task per (user, type): id breaks ties between tasks started in
+        # the same second, so the LIMIT 1 lookup never needs a sort
+        Index(
+            "idx_tasks_user_type_start_id",
+            "user_id",
+            "type",
+            sa_text("start DESC"),
+            sa_text("id DESC"),
+        ),
+        Index("idx_tasks_status_created", "status", "created_at"),
+        # Partial index covering only tasks still waiting for a result
+        Index(
+            "idx_tasks_active",
+            "user_id",
+            "updated_at",
+            postgresql_where=sa_text("status IN ('accepted', 'queued')"),
+        ),
     )
     
     def __repr__(self) -> str:
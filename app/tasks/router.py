@@ -6,12 +6,17 @@ Task-based API endpoints for review analysis according to    responses={
         500: {"model": ApiError, "description": "Internal server error"}
     }PI specification.
 """
-from typing import AsyncGenerator
+import asyncio
+import os
+import tempfile
+
 from fastapi import APIRouter, Depends, File, Form, UploadFile
 
+from ..core.config import settings
+from ..core.exceptions import ValidationError
 from ..core.logging import get_logger
-from ..infra.db.base import get_db_session, get_session_factory
-from ..infra.db.repo import TaskRepository
+from .dependencies import get_read_task_service, get_task_service
+from .exceptions import FileTooLarge
 from .service import TaskService
 from .schemas import (
     Task,
@@ -19,20 +24,52 @@ from .schemas import (
     BatchTaskResultRequest,
     SingleTaskRequest,
     ApiError,
-    ValidationError as ValidationErrorSchema
+    ValidationError as ValidationErrorSchema,
+    validate_user_id,
 )
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="", tags=["tasks"])
 
+# Copy uploads in 64KB chunks so oversized files are rejected early
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
-async def get_task_service() -> AsyncGenerator[TaskService, None]:
-    """Dependency for task service injection."""
-    session_factory = get_session_factory()
-    async for session in get_db_session(session_factory):
-        task_repo = TaskRepository(session)
-        yield TaskService(task_repo)
+async def spool_upload(file: UploadFile, max_size: int) -> str:
+    """
+    Copy uploaded file to a temp file in chunks, aborting as soon as it reaches the size limit.
+    
+    Only one chunk is held in memory at a time, and chunks are written from
+    a worker thread so disk I/O never blocks the event loop. The caller owns
+    the returned file and must remove it; on error it is removed here.
+    
+    Args:
+        file: Uploaded file
+        max_size: Maximum allowed size in bytes
+        
+    Returns:
+        Path of the temp file in settings.temp_dir
+        
+    Raises:
+        FileTooLarge: If file size reaches max_size
+    """
+    os.makedirs(settings.temp_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=settings.temp_dir, prefix="upload_")
+    try:
+        size = 0
+        with os.fdopen(fd, "wb") as tmp:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size >= max_size:
+                    # Report the whole upload when known, not the bytes read so far
+                    file_size = file.size if file.size is not None else max_size
+                    raise FileTooLarge(file_size, max_size, file.filename or "unknown")
+                await asyncio.to_thread(tmp.write, chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
 
 
 @router.post(
@@ -50,7 +87,7 @@ async def get_task_service() -> AsyncGenerator[TaskService, None]:
 )
 async def get_single_task_result(
     request_data: SingleTaskResultRequest,
-    task_service: TaskService = Depends(get_task_service)
+    task_service: TaskService = Depends(get_read_task_service)
 ) -> Task:
     """Get the last single task result for the user."""
     logger.info("Getting single task result", extra={"request_data": request_data.model_dump()})
@@ -73,7 +110,7 @@ async def get_single_task_result(
 )
 async def get_batch_task_result(
     request_data: BatchTaskResultRequest,
-    task_service: TaskService = Depends(get_task_service)
+    task_service: TaskService = Depends(get_read_task_service)
 ) -> Task:
     """Get the last batch task result for the user."""
     logger.info("Getting batch task result", extra={"request_data": request_data.model_dump()})    
@@ -123,20 +160,21 @@ async def create_batch_task(
 ) -> Task:
     """Create a batch file analysis task."""
     
-    # Validate user_id
-    from app.tasks.schemas import validate_user_id
-    from app.core.exceptions import ValidationError
+    # Validate user_id (form fields bypass the request schemas)
     try:
         user_id = validate_user_id(user_id)
     except ValueError as e:
         raise ValidationError(str(e))
     
     logger.info("Creating batch task", extra={"user_id": user_id, "file_name": file.filename})
-    file_content = await file.read()
-    task = await task_service.create_batch_task(
-        user_id=user_id,
-        file_content=file_content,
-        filename=file.filename or "unknown"
-    )
+    file_path = await spool_upload(file, settings.max_file_size_bytes)
+    try:
+        task = await task_service.create_batch_task_from_path(
+            user_id=user_id,
+            file_path=file_path,
+            filename=file.filename or "unknown"
+        )
+    finally:
+        os.unlink(file_path)
     return task
 
@@ -1,8 +1,8 @@
 """
 Pydantic schemas for tasks API according to OpenAPI specification.
 """
-from typing import Any, Optional, Dict, Union
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, Any, Optional, Dict, Union
+from pydantic import AfterValidator, BaseModel, Field, computed_field, field_validator
 from enum import Enum
 import re
 
@@ -36,30 +36,70 @@ class TaskErrorCodeEnum(str, Enum):
     code_03 = "03"
 
 
+# Characters and keywords rejected in user IDs (common punctuation is allowed)
+USER_ID_DANGEROUS_CHARS = frozenset("<>;&|`$")
+USER_ID_SQL_KEYWORDS = ('drop', 'select', 'insert', 'update', 'delete', 'union', 'script')
+
+# Script and SQL injection fragments rejected in texts, matched case-insensitively
+TEXT_DANGEROUS_PATTERNS = (
+    '<script',
+    'javascript:',
+    'onerror=',
+    'onload=',
+    'onclick=',
+    'onmouseover=',
+    'DROP TABLE',
+    'DELETE FROM',
+    'INSERT INTO',
+    'UPDATE SET',
+    'UNION SELECT',
+    "' OR '1'='1",
+    "'; --",
+)
+# Case-insensitive for ASCII only, like the patterns themselves: full Unicode
+# case folding would also match e.g. "\u017f" (long s) against "s"
+PATTERN_FLAGS = re.ASCII | re.IGNORECASE
+
+# User ID rules in reporting order, paired with their error messages
+USER_ID_RULES = (
+    (re.compile(r"\x00"), "User ID cannot contain null bytes"),
+    # tab is allowed
+    (re.compile(r"[\x01-\x08\x0a-\x1f]"), "User ID cannot contain control characters"),
+    (
+        re.compile(f"[{re.escape(''.join(sorted(USER_ID_DANGEROUS_CHARS)))}]"),
+        "User ID contains potentially dangerous characters",
+    ),
+    (
+        re.compile("|".join(USER_ID_SQL_KEYWORDS), PATTERN_FLAGS),
+        "User ID contains potentially dangerous SQL keywords",
+    ),
+)
+
+# Text patterns as listed, each with its own regex for error reporting
+TEXT_PATTERN_RULES = tuple(
+    (pattern, re.compile(re.escape(pattern), PATTERN_FLAGS)) for pattern in TEXT_DANGEROUS_PATTERNS
+)
+
+# Input checks compiled once; valid values are accepted after a single
+# pass. Only rejected values are rescanned rule by rule, so the reported
+# rule is the first one in list order, as before
+UNSAFE_USER_ID_PATTERN = re.compile(
+    "|".join(f"(?:{rule.pattern})" for rule, _ in USER_ID_RULES), PATTERN_FLAGS
+)
+UNSAFE_TEXT_PATTERN = re.compile(
+    "|".join(rule.pattern for _, rule in TEXT_PATTERN_RULES), PATTERN_FLAGS
+)
+
+
 def validate_user_id(v: str) -> str:
     """Validate and sanitize user_id."""
     if not v or not v.strip():
         raise ValueError("User ID cannot be empty or whitespace only")
     
-    # Remove dangerous characters including null bytes
-    if '\x00' in v:
-        raise ValueError("User ID cannot contain null bytes")
-    
-    # Check for other control characters
-    if any(ord(c) < 32 for c in v if c not in ['\t']):
-        raise ValueError("User ID cannot contain control characters")
-    
-    # Check for potentially dangerous characters that could be used in attacks
-    # Keep only the most dangerous ones, allow common punctuation
-    dangerous_chars = ['<', '>', ';', '&', '|', '`', '$']
-    if any(char in v for char in dangerous_chars):
-        raise ValueError("User ID contains potentially dangerous characters")
-    
-    # Check for SQL injection patterns
-    sql_patterns = ['drop', 'select', 'insert', 'update', 'delete', 'union', 'script']
-    v_lower = v.lower()
-    if any(pattern in v_lower for pattern in sql_patterns):
-        raise ValueError("User ID contains potentially dangerous SQL keywords")
+    # Reject null bytes, control characters, characters that could be used
+    # in attacks (common punctuation is allowed) and SQL injection keywords
+    if UNSAFE_USER_ID_PATTERN.search(v):
+        raise ValueError(next(message for rule, message in USER_ID_RULES if rule.search(v)))
     
     # Remove leading/trailing whitespace
     v = v.strip()
@@ -70,30 +110,25 @@ def validate_user_id(v: str) -> str:
     return v
 
 
+# user_id validated by the compiled check directly in pydantic's core
+# validator, without a per-model classmethod wrapper
+UserId = Annotated[str, AfterValidator(validate_user_id)]
+
+
 # Request schemas
 class SingleTaskResultRequest(BaseModel):
     """Request schema for getting single task result."""
-    user_id: str = Field(..., min_length=1, max_length=255, description="User identification from cookies", example="some cookies id")
-    
-    @field_validator('user_id')
-    @classmethod
-    def validate_user_id_field(cls, v: str) -> str:
-        return validate_user_id(v)
+    user_id: UserId = Field(..., min_length=1, max_length=255, description="User identification from cookies", example="some cookies id")
 
 
 class BatchTaskResultRequest(BaseModel):
     """Request schema for getting batch task result."""
-    user_id: str = Field(..., min_length=1, max_length=255, description="User identification from cookies", example="some cookies id")
-    
-    @field_validator('user_id')
-    @classmethod
-    def validate_user_id_field(cls, v: str) -> str:
-        return validate_user_id(v)
+    user_id: UserId = Field(..., min_length=1, max_length=255, description="User identification from cookies", example="some cookies id")
 
 
 class SingleTaskRequest(BaseModel):
     """Request schema for single text analysis task."""
-    user_id: str = Field(
+    user_id: UserId = Field(
         ..., 
         min_length=1, 
         max_length=255,
@@ -106,11 +141,6 @@ class SingleTaskRequest(BaseModel):
         description="Text to analyze (max 512 characters)"
     )
     
-    @field_validator('user_id')
-    @classmethod
-    def validate_user_id_field(cls, v: str) -> str:
-        return validate_user_id(v)
-    
     @field_validator('text')
     @classmethod
     def validate_text(cls, v: str) -> str:
@@ -123,26 +153,9 @@ class SingleTaskRequest(BaseModel):
             v = v.replace('\x00', '')
         
         # Check for potentially dangerous script content
-        dangerous_patterns = [
-            '<script',
-            'javascript:',
-            'onerror=',
-            'onload=',
-            'onclick=',
-            'onmouseover=',
-            'DROP TABLE',
-            'DELETE FROM',
-            'INSERT INTO',
-            'UPDATE SET',
-            'UNION SELECT',
-            "' OR '1'='1",
-            "'; --",
-        ]
-        
-        v_lower = v.lower()
-        for pattern in dangerous_patterns:
-            if pattern.lower() in v_lower:
-                raise ValueError(f"Text contains potentially dangerous content: {pattern}")
+        if UNSAFE_TEXT_PATTERN.search(v):
+            pattern = next(pattern for pattern, rule in TEXT_PATTERN_RULES if rule.search(v))
+            raise ValueError(f"Text contains potentially dangerous content: {pattern}")
         
         # Check for excessive length after sanitization
         v = v.strip()
@@ -161,14 +174,30 @@ class SingleResult(BaseModel):
 
 
 class BatchResult(BaseModel):
-    """Batch analysis result schema."""
+    """Batch analysis result schema; percentages are derived from the counts."""
     total_reviews: int = Field(..., ge=0, description="Total number of reviews processed")
     positive: int = Field(..., ge=0, description="Number of positive reviews")
     negative: int = Field(..., ge=0, description="Number of negative reviews")
     neutral: int = Field(..., ge=0, description="Number of neutral reviews")
-    positive_percentage: float = Field(..., ge=0.0, le=100.0, description="Percentage of positive reviews")
-    negative_percentage: float = Field(..., ge=0.0, le=100.0, description="Percentage of negative reviews")
-    neutral_percentage: float = Field(..., ge=0.0, le=100.0, description="Percentage of neutral reviews")
+    
+    def _percentage(self, count: int) -> float:
+        """Share of ``count`` in total_reviews, in percent rounded to 0.1."""
+        return round(count * 100.0 / self.total_reviews, 1) if self.total_reviews else 0.0
+    
+    @computed_field(description="Percentage of positive reviews")
+    @property
+    def positive_percentage(self) -> float:
+        return self._percentage(self.positive)
+    
+    @computed_field(description="Percentage of negative reviews")
+    @property
+    def negative_percentage(self) -> float:
+        return self._percentage(self.negative)
+    
+    @computed_field(description="Percentage of neutral reviews")
+    @property
+    def neutral_percentage(self) -> float:
+        return self._percentage(self.neutral)
 
 
 class TaskError(BaseModel):
@@ -5,14 +5,21 @@ This module contains the business logic for task management according to
 the domain-driven architecture principles from app/CONTEXT.MD and OpenAPI spec.
 """
 
+import asyncio
+import codecs
+import csv
+import io
+import os
+import re
 import time
-from datetime import datetime
-from typing import Optional
+from typing import BinaryIO, Iterable, Optional, Union
 
-print("DEBUG: Начинаем импорты в service.py")
+import orjson
 
+from app.core.config import settings
+from app.core.exceptions import ValidationError
 from app.core.logging import get_logger
-from app.infra.db.repo import TaskRepository
+from app.infra.db.repo import TaskReadRepository, TaskRepository
 from app.tasks.models import TaskType
 from .exceptions import TaskNotFound, InvalidTaskStatus, FileTooLarge, UnsupportedFormat
 from app.tasks.models import Task as DbTask
@@ -21,10 +28,30 @@ from app.tasks.schemas import (
     TaskTypeEnum, TaskStatusEnum, SentimentEnum
 )
 
-print("DEBUG: Все импорты завершены успешно")
-
 logger = get_logger(__name__)
 
+# Supported batch file types (lowercase extension without the leading dot)
+SUPPORTED_FILE_TYPES = frozenset(ext.lstrip(".") for ext in settings.allowed_extensions)
+
+# Phrases marking a single-row "CSV" as plain text rather than CSV data
+PLAIN_TEXT_CSV_PATTERN = re.compile(r"this is|it's just|not csv|just text", re.IGNORECASE)
+
+# Potentially dangerous script content rejected in uploaded files,
+# paired with the lowercase form used for case-insensitive matching
+DANGEROUS_FILE_PATTERNS = tuple(
+    (pattern, pattern.lower())
+    for pattern in (
+        '<script', 'javascript:', 'vbscript:', 'onload=', 'onerror=',
+        'eval(', 'exec(', 'system(', 'shell_exec(', 'passthru(',
+        'DROP TABLE', 'DELETE FROM', 'INSERT INTO', 'UPDATE SET'
+    )
+)
+# Characters of the previous chunk kept so patterns split across chunks still match
+DANGEROUS_PATTERN_OVERLAP = max(len(pattern) for pattern, _ in DANGEROUS_FILE_PATTERNS) - 1
+
+# Uploaded files are validated in chunks of this many bytes
+FILE_READ_CHUNK_SIZE = 64 * 1024
+
 
 class TaskService:
     """
@@ -37,8 +64,13 @@ class TaskService:
     - Domain-specific validations
     """
     
-    def __init__(self, task_repo: TaskRepository) -> None:
-        """Initialize task service with repository dependency."""
+    def __init__(self, task_repo: Union[TaskRepository, TaskReadRepository]) -> None:
+        """
+        Initialize task service with repository dependency.
+        
+        Read-only endpoints pass a TaskReadRepository; the get_last_* methods
+        accept its Core rows as well as ORM tasks.
+        """
         self.task_repo = task_repo
         
     async def create_single_task(
@@ -81,54 +113,66 @@ class TaskService:
         logger.info("Single task created", extra={"task_id": task.task_id})
         return task
         
-    async def create_batch_task(
+    async def create_batch_task_from_path(
         self,
         user_id: str,
-        file_content: bytes,
+        file_path: str,
         filename: str
     ) -> Task:
         """
-        Create a new batch file analysis task.
+        Create a new batch file analysis task from an upload spooled to disk.
+        
+        Size and format are checked before the file is opened; the content is
+        then read and validated in a worker thread, so it never passes
+        through the event loop. The file is left in place for the caller.
         
         Args:
             user_id: User identifier from cookies
-            file_content: File content bytes
+            file_path: Path of the uploaded file on disk
             filename: Original filename
             
         Returns:
             Created task with initial status
-            
+        
         Raises:
             FileTooLarge: If file is too large
             UnsupportedFormat: If file format is not supported
         """
+        file_size = os.path.getsize(file_path)
         logger.info("Creating batch task", extra={
             "user_id": user_id[:8] + "..." if len(user_id) > 8 else user_id,
             "file_name": filename,
-            "file_size": len(file_content)
+            "file_size": file_size
         })
         
         # Validate file size (max 10MB according to OpenAPI spec)
-        max_size = 10 * 1024 * 1024  # 10MB
-        if len(file_content) >= max_size:
-            raise FileTooLarge(len(file_content), max_size, filename)
-            
+        max_size = settings.max_file_size_bytes
+        if file_size >= max_size:
+            raise FileTooLarge(file_size, max_size, filename)
+        
         # Validate file format
-        valid_extensions = {'.csv', '.txt', '.json'}
-        file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
-        if f'.{file_ext}' not in valid_extensions:
+        file_ext = os.path.splitext(filename)[1][1:].lower()
+        if file_ext not in SUPPORTED_FILE_TYPES:
             raise UnsupportedFormat(filename, file_ext)
-            
-        # Validate file content
-        self._validate_file_content(file_content, file_ext, filename)
-            
-        # Create database task
+        
+        await asyncio.to_thread(self._validate_file_path, file_path, file_ext, filename)
+        
+        return await self._create_batch_db_task(user_id, filename, file_size, file_ext)
+    
+    async def _create_batch_db_task(
+        self,
+        user_id: str,
+        filename: str,
+        file_size: int,
+        file_ext: str
+    ) -> Task:
+        """Store a validated batch task and convert it to the domain model."""
         db_task = await self.task_repo.create(
             task_type=TaskType.batch,
             user_id=user_id,
             extra_data={
                 "filename": filename,
-                "file_size": len(file_content),
+                "file_size": file_size,
                 "file_type": file_ext
             }
         )
@@ -216,10 +260,7 @@ class TaskService:
                 total_reviews=db_task.total_reviews,
                 positive=db_task.positive,
                 negative=db_task.negative,
-                neutral=db_task.neutral,
-                positive_percentage=db_task.positive_percentage or 0.0,
-                negative_percentage=db_task.negative_percentage or 0.0,
-                neutral_percentage=db_task.neutral_percentage or 0.0
+                neutral=db_task.neutral
             )
             
         logger.info("Batch task retrieved", extra={"task_id": task.task_id})
@@ -268,7 +309,7 @@ class TaskService:
         if error:
             update_data["error"] = error.model_dump()
         if status in [TaskStatusEnum.ready, TaskStatusEnum.error]:
-            update_data["end_time"] = datetime.utcnow()
+            update_data["end"] = int(time.time())
             
         updated_db_task = await self.task_repo.update(db_task.id, update_data)
         if not updated_db_task:
@@ -316,118 +357,192 @@ class TaskService:
             error=error
         )
         
-    def _validate_file_content(self, file_content: bytes, file_ext: str, filename: str) -> None:
+    def _validate_file_path(self, file_path: str, file_ext: str, filename: str) -> None:
+        """
+        Validate a file on disk in streaming form (runs in a worker thread).
+        
+        Args:
+            file_path: Path of the file on disk
+            file_ext: Lowercase file extension without the leading dot
+            filename: Original filename
+        
+        Raises:
+            ValidationError: If file content is invalid or potentially dangerous
+        """
+        with open(file_path, "rb") as f:
+            self._validate_file_stream(f, file_ext, filename)
+    
+    def _validate_file_stream(self, stream: BinaryIO, file_ext: str, filename: str) -> None:
         """
         Validate file content for security and format issues.
         
+        The content is read in FILE_READ_CHUNK_SIZE chunks and decoded
+        incrementally; text and CSV files are never held in memory as a whole
+        (CSV is re-read once for row parsing). JSON has no streaming parser
+        here, so JSON files are loaded whole for orjson after the scan.
+        Errors are reported in the order of the checks, as for a single pass
+        over the whole content.
+        
         Args:
-            file_content: File content bytes
-            file_ext: File extension
+            stream: Binary file object positioned at the start
+            file_ext: Lowercase file extension without the leading dot
             filename: Original filename
             
         Raises:
             ValidationError: If file content is invalid or potentially dangerous
         """
-        from app.core.exceptions import ValidationError
+        # Determine if this is a CSV file
+        is_csv = file_ext == 'csv'
+        
+        # Unreasonably long lines (potential attack): strict for CSV to
+        # prevent CSV injection, much larger lines allowed for regular text
+        if is_csv:
+            def is_too_long(length: int) -> bool:
+                return length > 5000  # More than 5KB per line for CSV
+        else:
+            def is_too_long(length: int) -> bool:
+                return length >= 50000000  # 50MB per line - only for extreme cases
+        
+        decoder = codecs.getincrementaldecoder('utf-8')('strict')
+        has_content = False
+        has_null = False
+        line_number, line_length = 1, 0
+        long_line = None
+        quote_count = 0
+        found_patterns = set()
+        tail = ""
+        
+        while True:
+            chunk = stream.read(FILE_READ_CHUNK_SIZE)
+            if chunk:
+                # Empty files are whitespace only (checked without a stripped copy)
+                has_content = has_content or not chunk.isspace()
+                # Null bytes and other dangerous binary content, on the raw bytes
+                has_null = has_null or b'\x00' in chunk
+            
+            # Check for binary content or control characters
+            try:
+                text = decoder.decode(chunk, final=not chunk)
+            except UnicodeDecodeError:
+                raise ValidationError("File must be valid UTF-8 text")
+            
+            # Track the first line over the limit, reported with its full length
+            if long_line is None:
+                pieces = text.split('\n')
+                line_length += len(pieces[0])
+                for piece in pieces[1:]:
+                    if is_too_long(line_length):
+                        long_line = (line_number, line_length)
+                        break
+                    line_number += 1
+                    line_length = len(piece)
+            
+            # Dangerous patterns, including ones split across chunk boundaries
+            window = tail + text
+            window_lower = window.lower()
+            for index, (_, pattern_lower) in enumerate(DANGEROUS_FILE_PATTERNS):
+                if pattern_lower in window_lower:
+                    found_patterns.add(index)
+            tail = window[-DANGEROUS_PATTERN_OVERLAP:]
+            
+            if is_csv:
+                quote_count += text.count('"')
+            
+            if not chunk:
+                break
+        
+        if long_line is None and is_too_long(line_length):
+            long_line = (line_number, line_length)
         
         # Check for empty files
-        if len(file_content.strip()) == 0:
+        if not has_content:
             raise ValidationError("File cannot be empty")
-            
-        # Check for binary content or control characters
-        try:
-            content_str = file_content.decode('utf-8', errors='strict')
-        except UnicodeDecodeError:
-            raise ValidationError("File must be valid UTF-8 text")
-            
-        # Check for null bytes and other dangerous binary content
-        if '\x00' in content_str:
+        
+        if has_null:
             raise ValidationError("File contains null bytes")
-            
-        # Determine if this is a CSV file
-        is_csv = file_ext.lower() == 'csv'
-            
-        # Check for unreasonably long lines (potential attack)
-        lines = content_str.split('\n')
-        for i, line in enumerate(lines):
-            # For CSV files, be strict about line length to prevent CSV injection
-            if is_csv and len(line) > 5000:  # More than 5KB per line for CSV
-                logger.warning(f"Very long CSV line detected (line {i+1}, length {len(line)}) in file {filename}")
-                raise ValidationError(f"CSV line {i+1} is too long ({len(line)} characters)")
-            # For regular text files, allow much larger lines for legitimate use cases  
-            elif not is_csv and len(line) >= 50000000:  # 50MB per line - only for extreme cases
-                logger.warning(f"Extremely long line detected (line {i+1}, length {len(line)}) in file {filename}")
-                raise ValidationError(f"Line {i+1} is too long ({len(line)} characters)")
-                
-        # Check for potentially dangerous script content
-        dangerous_patterns = [
-            '<script', 'javascript:', 'vbscript:', 'onload=', 'onerror=',
-            'eval(', 'exec(', 'system(', 'shell_exec(', 'passthru(',
-            'DROP TABLE', 'DELETE FROM', 'INSERT INTO', 'UPDATE SET'
-        ]
-        
-        content_lower = content_str.lower()
-        for pattern in dangerous_patterns:
-            if pattern.lower() in content_lower:
-                logger.warning(f"Dangerous pattern detected: {pattern} in file {filename}")
-                raise ValidationError(f"File contains potentially dangerous content: {pattern}")
-                
+        
+        if long_line is not None:
+            line_number, line_length = long_line
+            where = f"line {line_number}, length {line_length}"
+            if is_csv:
+                logger.warning(f"Very long CSV line detected ({where}) in file {filename}")
+                raise ValidationError(
+                    f"CSV line {line_number} is too long ({line_length} characters)"
+                )
+            logger.warning(f"Extremely long line detected ({where}) in file {filename}")
+            raise ValidationError(f"Line {line_number} is too long ({line_length} characters)")
+        
+        # Check for potentially dangerous script content (first pattern in list order)
+        if found_patterns:
+            pattern = DANGEROUS_FILE_PATTERNS[min(found_patterns)][0]
+            logger.warning(f"Dangerous pattern detected: {pattern} in file {filename}")
+            raise ValidationError(f"File contains potentially dangerous content: {pattern}")
+        
         # Validate content format based on extension
-        if file_ext == 'csv':
-            self._validate_csv_content(content_str)
+        stream.seek(0)
+        if is_csv:
+            text_stream = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+            try:
+                self._validate_csv_rows(text_stream, quote_count)
+            finally:
+                text_stream.detach()
         elif file_ext == 'json':
-            self._validate_json_content(content_str)
-            
-    def _validate_csv_content(self, content: str) -> None:
-        """Validate CSV format."""
-        from app.core.exceptions import ValidationError
-        import csv
-        import io
+            self._validate_json_content(stream.read())
+    
+    def _validate_csv_rows(self, lines: Iterable[str], quote_count: int) -> None:
+        """
+        Validate CSV format.
+        
+        Args:
+            lines: CSV text lines, e.g. a text file object
+            quote_count: Number of double quotes in the content
         
+        Raises:
+            ValidationError: If the CSV is malformed
+        """
         try:
-            # Try to parse as CSV
-            csv_reader = csv.reader(io.StringIO(content))
-            rows = list(csv_reader)
+            # Parse as CSV in a single streaming pass, without materializing all rows
+            csv_reader = csv.reader(lines)
+            first_row = None
+            expected_cols = 0
+            row_count = 0
+            
+            for row_count, row in enumerate(csv_reader, start=1):
+                if first_row is None:
+                    first_row = row
+                    expected_cols = len(row)
+                    
+                    # Check for reasonable number of columns
+                    if expected_cols > 100:  # Reasonable limit
+                        raise ValidationError("CSV file has too many columns")
+                elif len(row) != expected_cols:
+                    # Validate that all rows have consistent number of columns
+                    raise ValidationError(f"CSV row {row_count} has {len(row)} columns, expected {expected_cols}")
+                    
+                # Check for unclosed quotes or malformed CSV
+                # If we have unclosed quotes, the last row might have unexpected structure
+                for j, field in enumerate(row):
+                    # Check for suspicious patterns in fields
+                    if len(field) > 10000:  # Field too long
+                        raise ValidationError(f"CSV field in row {row_count}, column {j+1} is too long")
             
-            if len(rows) == 0:
+            if first_row is None:
                 raise ValidationError("CSV file has no content")
                 
             # CSV files should have at least 2 rows (header + data) or multiple columns
-            if len(rows) < 2:
+            if row_count < 2:
                 # If only one row, it should have multiple columns to be a valid CSV
-                first_row_cols = len(rows[0]) if rows else 0
-                if first_row_cols < 2:
+                if expected_cols < 2:
                     raise ValidationError("Invalid CSV format: CSV must have either multiple rows or multiple columns")
                 else:
                     # Single row with multiple columns should look like a proper CSV header
                     # Check if it contains typical CSV content patterns
-                    row_content = ",".join(rows[0]).lower()
+                    row_content = ",".join(first_row)
                     # If it's just plain text without typical CSV structure, reject it
-                    if any(word in row_content for word in ["this is", "it's just", "not csv", "just text"]):
+                    if PLAIN_TEXT_CSV_PATTERN.search(row_content):
                         raise ValidationError("Invalid CSV format: Content appears to be plain text, not CSV data")
-            
-            # Check for reasonable number of columns
-            first_row_cols = len(rows[0]) if rows else 0
-            if first_row_cols > 100:  # Reasonable limit
-                raise ValidationError("CSV file has too many columns")
-                
-            # Validate that all rows have consistent number of columns
-            if len(rows) > 1:
-                expected_cols = len(rows[0])
-                for i, row in enumerate(rows[1:], start=2):
-                    if len(row) != expected_cols:
-                        raise ValidationError(f"CSV row {i} has {len(row)} columns, expected {expected_cols}")
-                
-            # Check for unclosed quotes or malformed CSV
-            # If we have unclosed quotes, the last row might have unexpected structure
-            for i, row in enumerate(rows):
-                for j, field in enumerate(row):
-                    # Check for suspicious patterns in fields
-                    if len(field) > 10000:  # Field too long
-                        raise ValidationError(f"CSV field in row {i+1}, column {j+1} is too long")
                         
             # Additional check: count quotes to detect unclosed quotes
-            quote_count = content.count('"')
             if quote_count % 2 != 0:
                 raise ValidationError("CSV contains unclosed quotes")
                 
@@ -438,19 +553,17 @@ class TaskService:
                 raise
             raise ValidationError(f"Invalid CSV format: {str(e)}")
             
-    def _validate_json_content(self, content: str) -> None:
+    def _validate_json_content(self, content: bytes) -> None:
         """Validate JSON format."""
-        from app.core.exceptions import ValidationError
-        import json
-        
         try:
-            data = json.loads(content)
+            # orjson parses the raw bytes directly, no intermediate str needed
+            data = orjson.loads(content)
             
             # Basic size check for JSON
             if isinstance(data, dict) and len(data) > 10000:
                 raise ValidationError("JSON file is too complex")
                 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValidationError(f"Invalid JSON format: {str(e)}")
         
     def _is_valid_status_transition(
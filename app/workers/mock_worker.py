@@ -6,17 +6,25 @@ Simulates real task processing workflow.
 import asyncio
 import logging
 import time
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.infra.db.base import get_session_factory
+from app.infra.db.repo import TaskRepository, UserSessionRepository
 from app.tasks.models import Task, TaskStatus, TaskType, SentimentEnum
 
 logger = logging.getLogger(__name__)
 
+# Expired sessions deleted per transaction by the cleanup sweep
+SESSION_CLEANUP_BATCH_SIZE = 1000
+# Age after which pending-deletion marks of a crashed sweep are taken over
+SESSION_MARK_STALE_AFTER = timedelta(hours=1)
+
 
 class MockWorker:
     """Mock worker that processes tasks in background."""
@@ -24,6 +32,7 @@ class MockWorker:
     def __init__(self):
         self.session_factory = get_session_factory()
         self.is_running = False
+        self._next_session_cleanup = 0.0
         
     async def start(self):
         """Start the mock worker."""
@@ -33,6 +42,7 @@ class MockWorker:
         while self.is_running:
             try:
                 await self._process_pending_tasks()
+                await self._cleanup_expired_sessions()
                 await asyncio.sleep(1)  # Check for new tasks every second
             except Exception as e:
                 logger.error(f"Error in mock worker: {e}")
@@ -51,25 +61,82 @@ class MockWorker:
             
             # Find queued tasks and process them
             await self._process_queued_tasks(session)
+    
+    async def _cleanup_expired_sessions(self):
+        """
+        Delete expired user sessions, at most once per cleanup interval.
+        
+        The sweep runs here on a timer rather than in request handlers, so
+        requests never pay for scanning expired sessions.
+        """
+        now = time.monotonic()
+        if now < self._next_session_cleanup:
+            return
+        self._next_session_cleanup = now + settings.session_cleanup_interval_minutes * 60
+        
+        async with self.session_factory() as session:
+            try:
+                deleted = await self._delete_expired_sessions(
+                    session, datetime.now(timezone.utc) - timedelta(days=settings.session_ttl_days)
+                )
+                if deleted:
+                    logger.info(f"Deleted {deleted} expired user sessions")
+            except Exception as e:
+                logger.error(f"Error cleaning up expired sessions: {e}")
+                await session.rollback()
+    
+    async def _delete_expired_sessions(
+        self,
+        session: AsyncSession,
+        older_than: datetime,
+        batch_size: int = SESSION_CLEANUP_BATCH_SIZE,
+        stale_after: timedelta = SESSION_MARK_STALE_AFTER,
+    ) -> int:
+        """
+        Delete sessions inactive since ``older_than`` in small batches.
+        
+        Each batch of expired ids is marked under a marker unique to this
+        sweep and committed, then deleted in a second transaction, so no
+        single statement locks the table for long and concurrent sweeps work
+        on disjoint batches. Marks committed by a sweep that crashed before
+        its delete are taken over once older than ``stale_after``.
+        
+        Returns:
+            Number of deleted sessions
+        """
+        repo = UserSessionRepository(session)
+        marked_by = uuid.uuid4().hex
+        
+        marked = await repo.take_over_stale_marks(
+            marked_by, datetime.now(timezone.utc) - stale_after
+        )
+        await session.commit()
+        
+        deleted = 0
+        while True:
+            if not marked:
+                marked = await repo.mark_expired_sessions(marked_by, older_than, batch_size)
+                await session.commit()
+                if not marked:
+                    break
+            
+            deleted += await repo.delete_marked_sessions(marked_by)
+            await session.commit()
+            marked = 0
+        
+        return deleted
             
     async def _process_accepted_tasks(self, session: AsyncSession):
         """Move accepted tasks to queued status."""
         try:
-            # Find accepted tasks
-            result = await session.execute(
-                select(Task).where(Task.status == TaskStatus.accepted)
+            # Claim accepted tasks and move them to queued in one statement;
+            # rows locked by another worker are skipped, not waited on
+            accepted_tasks = await TaskRepository(session).claim_tasks(
+                TaskStatus.accepted, TaskStatus.queued
             )
-            accepted_tasks = result.scalars().all()
             
             for task in accepted_tasks:
-                logger.info(f"Moving task {task.task_id} from accepted to queued")
-                
-                # Update status to queued
-                await session.execute(
-                    update(Task)
-                    .where(Task.id == task.id)
-                    .values(status=TaskStatus.queued)
-                )
+                logger.info(f"Moved task {task.task_id} from accepted to queued")
                 
             if accepted_tasks:
                 await session.commit()
@@ -83,13 +150,15 @@ class MockWorker:
         """Process queued tasks after 5 second delay."""
         try:
             # Find queued tasks that have been queued for at least 5 seconds
-            five_seconds_ago = datetime.utcnow() - timedelta(seconds=5)
+            five_seconds_ago = datetime.now(timezone.utc) - timedelta(seconds=5)
             
             result = await session.execute(
-                select(Task).where(
+                select(Task)
+                .where(
                     Task.status == TaskStatus.queued,
                     Task.updated_at <= five_seconds_ago
                 )
+                .with_for_update(skip_locked=True)
             )
             queued_tasks = result.scalars().all()
             
@@ -116,16 +185,12 @@ class MockWorker:
         mock_sentiment = self._mock_analyze_sentiment(task.text)
         
         # Update task with results
-        await session.execute(
-            update(Task)
-            .where(Task.id == task.id)
-            .values(
-                status=TaskStatus.ready,
-                end=int(time.time()),
-                sentiment=mock_sentiment["sentiment"],
-                confidence=mock_sentiment["confidence"]
-            )
-        )
+        await TaskRepository(session).update_fields(task.id, {
+            "status": TaskStatus.ready,
+            "end": int(time.time()),
+            "sentiment": mock_sentiment["sentiment"],
+            "confidence": mock_sentiment["confidence"]
+        })
         
     async def _process_batch_task(self, session: AsyncSession, task: Task):
         """Process batch file analysis task."""
@@ -133,21 +198,11 @@ class MockWorker:
         mock_results = self._mock_batch_analysis()
         
         # Update task with results
-        await session.execute(
-            update(Task)
-            .where(Task.id == task.id)
-            .values(
-                status=TaskStatus.ready,
-                end=int(time.time()),
-                total_reviews=mock_results["total_reviews"],
-                positive=mock_results["positive"],
-                negative=mock_results["negative"],
-                neutral=mock_results["neutral"],
-                positive_percentage=mock_results["positive_percentage"],
-                negative_percentage=mock_results["negative_percentage"],
-                neutral_percentage=mock_results["neutral_percentage"]
-            )
-        )
+        await TaskRepository(session).update_fields(task.id, {
+            "status": TaskStatus.ready,
+            "end": int(time.time()),
+            **mock_results
+        })
         
     def _mock_analyze_sentiment(self, text: Optional[str]) -> dict:
         """Mock sentiment analysis for single text."""
@@ -182,10 +237,7 @@ class MockWorker:
             "total_reviews": total,
             "positive": positive,
             "negative": negative, 
-            "neutral": neutral,
-            "positive_percentage": round((positive / total) * 100, 1),
-            "negative_percentage": round((negative / total) * 100, 1),
-            "neutral_percentage": round((neutral / total) * 100, 1)
+            "neutral": neutral
         }
 
 
@@ -65,4 +65,5 @@ fi
 
 # Start the application
 echo "Starting FastAPI application..."
-exec python -m uvicorn app.main:app --host 0.0.0.0 --port 8000
+exec python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 \
+    --workers "${WORKERS:-2}" --loop uvloop --http httptools
@@ -0,0 +1,246 @@
+"""
+Task repository tests.
+
+Tests the repository queries against the PostgreSQL test container.
+"""
+
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infra.db.repo import TaskReadRepository, TaskRepository, UserSessionRepository
+from app.infra.db.sessions import UserSession
+from app.tasks.models import Task, TaskStatus, TaskType
+
+
+pytestmark = pytest.mark.integration
+
+LONG_AGO = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+async def _create_tasks(
+    session: AsyncSession,
+    count: int,
+    user_id: str = "test_user",
+    task_type: TaskType = TaskType.single,
+    status: TaskStatus = TaskStatus.accepted,
+) -> List[Task]:
+    """Create tasks sharing one created_at, so pages are split on id alone."""
+    repo = TaskRepository(session)
+    tasks = [await repo.create(task_type, user_id) for _ in range(count)]
+    await session.execute(
+        update(Task)
+        .where(Task.id.in_([task.id for task in tasks]))
+        .values(created_at=func.now(), status=status)
+    )
+    await session.commit()
+    return tasks
+
+
+async def _all_pages(repo, limit: int, **filters) -> List[List[int]]:
+    """Walk get_user_tasks page by page and return the ids of each page."""
+    pages = []
+    cursor = None
+    while True:
+        tasks, cursor = await repo.get_user_tasks(
+            "test_user", limit=limit, cursor=cursor, **filters
+        )
+        pages.append([task.id for task in tasks])
+        if cursor is None:
+            return pages
+
+
+@pytest.fixture(params=[TaskRepository, TaskReadRepository], ids=["orm", "core"])
+def listing_repository(request, db_session: AsyncSession):
+    """Both get_user_tasks implementations: ORM entities and Core rows."""
+    return request.param(db_session)
+
+
+class TestUserTaskPagination:
+    """Keyset pagination of get_user_tasks."""
+    
+    @pytest.mark.asyncio
+    async def test_pages_split_tasks_with_equal_created_at(self, db_session, listing_repository):
+        """Tasks created at the same instant are neither repeated nor skipped across pages."""
+        tasks = await _create_tasks(db_session, 5)
+        
+        pages = await _all_pages(listing_repository, limit=2)
+        
+        expected = sorted((task.id for task in tasks), reverse=True)
+        assert pages == [expected[0:2], expected[2:4], expected[4:5]]
+    
+    @pytest.mark.asyncio
+    async def test_last_page_returns_no_cursor(self, db_session, listing_repository):
+        """A short page ends the listing; a full page hands out its last (created_at, id)."""
+        tasks = await _create_tasks(db_session, 3)
+        newest_first = sorted((task.id for task in tasks), reverse=True)
+        
+        page, cursor = await listing_repository.get_user_tasks("test_user", limit=2)
+        assert [task.id for task in page] == newest_first[:2]
+        assert cursor == (page[-1].created_at, newest_first[1])
+        
+        page, cursor = await listing_repository.get_user_tasks("test_user", limit=2, cursor=cursor)
+        assert [task.id for task in page] == newest_first[2:]
+        assert cursor is None
+    
+    @pytest.mark.asyncio
+    async def test_full_last_page_is_followed_by_empty_page(self, db_session, listing_repository):
+        """When the last page is full, the following page is empty and has no cursor."""
+        await _create_tasks(db_session, 4)
+        
+        pages = await _all_pages(listing_repository, limit=2)
+        
+        assert [len(page) for page in pages] == [2, 2, 0]
+    
+    @pytest.mark.asyncio
+    async def test_filters_combined_with_cursor(self, db_session, listing_repository):
+        """Type and status filters still apply to pages after the first."""
+        wanted = await _create_tasks(
+            db_session, 3, task_type=TaskType.batch, status=TaskStatus.ready
+        )
+        await _create_tasks(db_session, 2, task_type=TaskType.single, status=TaskStatus.ready)
+        await _create_tasks(db_session, 2, task_type=TaskType.batch, status=TaskStatus.queued)
+        await _create_tasks(db_session, 2, user_id="other_user", task_type=TaskType.batch,
+                            status=TaskStatus.ready)
+        
+        pages = await _all_pages(
+            listing_repository, limit=2, task_type=TaskType.batch, status=TaskStatus.ready
+        )
+        
+        expected = sorted((task.id for task in wanted), reverse=True)
+        assert pages == [expected[0:2], expected[2:3]]
+    
+    @pytest.mark.asyncio
+    async def test_single_filter_combined_with_cursor(self, db_session, listing_repository):
+        """A lone status filter is kept on cursor pages."""
+        wanted = await _create_tasks(db_session, 3, status=TaskStatus.error)
+        await _create_tasks(db_session, 3, status=TaskStatus.ready)
+        
+        pages = await _all_pages(listing_repository, limit=2, status=TaskStatus.error)
+        
+        expected = sorted((task.id for task in wanted), reverse=True)
+        assert pages == [expected[0:2], expected[2:3]]
+
+
+class TestClaimTasks:
+    """Status hand-over through claim_tasks."""
+    
+    @pytest.mark.asyncio
+    async def test_claimed_tasks_leave_source_status(self, db_session):
+        """Claimed rows are returned with, and stored under, the new status."""
+        tasks = await _create_tasks(db_session, 3)
+        repo = TaskRepository(db_session)
+        
+        claimed = await repo.claim_tasks(TaskStatus.accepted, TaskStatus.queued, limit=2)
+        await db_session.commit()
+        
+        assert len(claimed) == 2
+        assert all(task.status == TaskStatus.queued for task in claimed)
+        claimed_ids = {task.id for task in claimed}
+        remaining = await repo.get_tasks_by_status(TaskStatus.accepted)
+        assert {task.id for task in remaining} == {task.id for task in tasks} - claimed_ids
+        stored = await db_session.execute(
+            select(Task.status).where(Task.id.in_(claimed_ids))
+        )
+        assert set(stored.scalars()) == {TaskStatus.queued}
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_claims_are_disjoint(self, db_session, db_engine):
+        """A second worker skips rows locked by an uncommitted claim instead of taking them."""
+        tasks = await _create_tasks(db_session, 5)
+        session_factory = async_sessionmaker(db_engine, expire_on_commit=False)
+        
+        async with session_factory() as first, session_factory() as second:
+            first_claimed = await TaskRepository(first).claim_tasks(
+                TaskStatus.accepted, TaskStatus.queued, limit=3
+            )
+            # The first claim is still uncommitted and holds its row locks
+            second_claimed = await TaskRepository(second).claim_tasks(
+                TaskStatus.accepted, TaskStatus.queued, limit=3
+            )
+            await first.commit()
+            await second.commit()
+        
+        first_ids = {task.id for task in first_claimed}
+        second_ids = {task.id for task in second_claimed}
+        assert len(first_ids) == 3
+        assert len(second_ids) == 2
+        assert first_ids.isdisjoint(second_ids)
+        assert first_ids | second_ids == {task.id for task in tasks}
+        
+        remaining = await TaskRepository(db_session).get_tasks_by_status(TaskStatus.accepted)
+        assert remaining == []
+
+
+class TestSessionCreateOrUpdate:
+    """Upsert and activity throttling of UserSessionRepository.create_or_update."""
+    
+    @pytest.mark.asyncio
+    async def test_insert_new_session(self, db_session):
+        """An unknown session id is inserted with the given fields."""
+        repo = UserSessionRepository(db_session)
+        
+        user_session = await repo.create_or_update(
+            "session-1", "test_user", ip_address="127.0.0.1", user_agent="pytest"
+        )
+        await db_session.commit()
+        
+        assert user_session.id is not None
+        assert user_session.user_id == "test_user"
+        assert user_session.ip_address == "127.0.0.1"
+        assert user_session.user_agent == "pytest"
+        assert user_session.extra_data == {}
+        assert (await repo.get_by_session_id("session-1")).id == user_session.id
+    
+    @pytest.mark.asyncio
+    async def test_refresh_within_window_returns_existing_row(self, db_session):
+        """A bare refresh of a recently active session skips the write and returns the row."""
+        repo = UserSessionRepository(db_session)
+        created = await repo.create_or_update("session-1", "test_user", ip_address="127.0.0.1")
+        await db_session.commit()
+        last_activity = created.last_activity
+        
+        refreshed = await repo.create_or_update("session-1", "test_user")
+        await db_session.commit()
+        
+        assert refreshed.id == created.id
+        assert refreshed.ip_address == "127.0.0.1"
+        assert refreshed.last_activity == last_activity
+    
+    @pytest.mark.asyncio
+    async def test_refresh_outside_window_updates_last_activity(self, db_session):
+        """Once the stored activity is older than the refresh interval it is rewritten."""
+        repo = UserSessionRepository(db_session)
+        created = await repo.create_or_update("session-1", "test_user", ip_address="127.0.0.1")
+        await db_session.execute(
+            update(UserSession)
+            .where(UserSession.id == created.id)
+            .values(last_activity=LONG_AGO)
+        )
+        await db_session.commit()
+        stale = (await db_session.execute(
+            select(UserSession.last_activity).where(UserSession.id == created.id)
+        )).scalar_one()
+        
+        refreshed = await repo.create_or_update("session-1", "test_user")
+        await db_session.commit()
+        
+        assert refreshed.id == created.id
+        assert refreshed.ip_address == "127.0.0.1"
+        assert refreshed.last_activity > stale
+    
+    @pytest.mark.asyncio
+    async def test_new_fields_are_written_within_window(self, db_session):
+        """Changed tracking fields are not throttled like a bare refresh."""
+        repo = UserSessionRepository(db_session)
+        created = await repo.create_or_update("session-1", "test_user", user_agent="old")
+        await db_session.commit()
+        
+        updated = await repo.create_or_update("session-1", "test_user", user_agent="new")
+        await db_session.commit()
+        
+        assert updated.id == created.id
+        assert updated.user_agent == "new"
@@ -0,0 +1,216 @@
+"""
+Review service tests.
+
+Tests ReviewService writes, listings and cached statistics against the
+PostgreSQL test container.
+"""
+
+from typing import List
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.review import Review
+from app.schemas.review import ReviewCreate, ReviewUpdate
+from app.services.review_service import ReviewService, invalidate_statistics_cache
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(autouse=True)
+def statistics_cache():
+    """Every test starts and ends with an empty per-process statistics cache."""
+    invalidate_statistics_cache()
+    yield
+    invalidate_statistics_cache()
+
+
+@pytest.fixture
+def review_service(db_session: AsyncSession) -> ReviewService:
+    """Review service on the test session."""
+    return ReviewService(db_session)
+
+
+def _reviews(*sentiments: str, text: str = "review") -> List[ReviewCreate]:
+    """One review per sentiment, texts numbered in order."""
+    return [
+        ReviewCreate(text=f"{text} {i}", sentiment=sentiment, confidence=0.9, source="test")
+        for i, sentiment in enumerate(sentiments)
+    ]
+
+
+class TestBulkCreateReviews:
+    """bulk_create_reviews tests."""
+    
+    @pytest.mark.asyncio
+    async def test_returns_created_reviews_in_input_order(self, review_service):
+        """One INSERT ... RETURNING yields persisted reviews in input order."""
+        reviews = await review_service.bulk_create_reviews(
+            _reviews("positive", "negative", "neutral")
+        )
+        
+        assert [review.text for review in reviews] == ["review 0", "review 1", "review 2"]
+        assert all(review.id is not None for review in reviews)
+        assert await review_service.get_review(reviews[1].id) is not None
+    
+    @pytest.mark.asyncio
+    async def test_empty_input(self, review_service):
+        """No reviews, no statement."""
+        assert await review_service.bulk_create_reviews([]) == []
+
+
+class TestCreateReviewsBulk:
+    """create_reviews_bulk tests."""
+    
+    @pytest.mark.asyncio
+    async def test_inserts_generator_in_chunks(self, review_service, db_session, monkeypatch):
+        """A lazy iterable is consumed chunk_size rows per executemany, remainder last."""
+        chunk_sizes = []
+        execute = db_session.execute
+        
+        async def spy_execute(statement, params=None, *args, **kwargs):
+            if isinstance(params, list):
+                chunk_sizes.append(len(params))
+            return await execute(statement, params, *args, **kwargs)
+        
+        monkeypatch.setattr(db_session, "execute", spy_execute)
+        reviews = (review for review in _reviews(*["positive"] * 5))
+        
+        inserted = await review_service.create_reviews_bulk(reviews, chunk_size=2)
+        
+        assert inserted == 5
+        assert chunk_sizes == [2, 2, 1]
+        monkeypatch.undo()
+        stored = await review_service.get_reviews(limit=10)
+        assert sorted(review.text for review in stored) == [f"review {i}" for i in range(5)]
+    
+    @pytest.mark.asyncio
+    async def test_empty_iterable(self, review_service):
+        """Nothing to insert, nothing committed."""
+        assert await review_service.create_reviews_bulk(iter([])) == 0
+
+
+class TestGetReviewsCursor:
+    """Keyset pagination tests for get_reviews."""
+    
+    @pytest.mark.asyncio
+    async def test_cursor_pages_continue_without_overlap(self, review_service):
+        """Following the last id of each page walks every review once, newest first."""
+        created = await review_service.bulk_create_reviews(_reviews(*["neutral"] * 5))
+        ids = sorted((review.id for review in created), reverse=True)
+        
+        first_page = await review_service.get_reviews(limit=2, cursor=ids[0] + 1)
+        second_page = await review_service.get_reviews(limit=2, cursor=first_page[-1].id)
+        third_page = await review_service.get_reviews(limit=2, cursor=second_page[-1].id)
+        last_page = await review_service.get_reviews(limit=2, cursor=third_page[-1].id)
+        
+        assert [review.id for review in first_page] == ids[:2]
+        assert [review.id for review in second_page] == ids[2:4]
+        assert [review.id for review in third_page] == ids[4:]
+        assert last_page == []
+    
+    @pytest.mark.asyncio
+    async def test_cursor_ignores_skip(self, review_service):
+        """With a cursor, skip is not applied on top of the keyset filter."""
+        created = await review_service.bulk_create_reviews(_reviews(*["neutral"] * 3))
+        top_id = max(review.id for review in created)
+        
+        page = await review_service.get_reviews(skip=2, limit=10, cursor=top_id)
+        
+        assert len(page) == 2
+        assert all(review.id < top_id for review in page)
+
+
+class TestReviewSummaries:
+    """get_review_summaries_by_sentiment tests."""
+    
+    @pytest.mark.asyncio
+    async def test_filters_by_sentiment_and_truncates_text(self, review_service):
+        """Only matching reviews come back, text cut to max_chars and flagged."""
+        await review_service.bulk_create_reviews([
+            ReviewCreate(text="short", sentiment="positive", confidence=0.8),
+            ReviewCreate(text="x" * 30, sentiment="positive", confidence=0.7),
+            ReviewCreate(text="exactly10!", sentiment="positive", confidence=0.6),
+            ReviewCreate(text="y" * 30, sentiment="negative", confidence=0.9),
+        ])
+        
+        summaries = await review_service.get_review_summaries_by_sentiment(
+            "positive", max_chars=10
+        )
+        
+        by_text = {summary["text"]: summary for summary in summaries}
+        assert set(by_text) == {"short", "x" * 10, "exactly10!"}
+        assert not by_text["short"]["is_truncated"]
+        assert by_text["x" * 10]["is_truncated"]
+        assert not by_text["exactly10!"]["is_truncated"]
+        assert by_text["x" * 10]["confidence"] == pytest.approx(0.7)
+        assert set(summaries[0]) == {"id", "text", "is_truncated", "confidence", "created_at"}
+    
+    @pytest.mark.asyncio
+    async def test_unknown_sentiment(self, review_service):
+        """A sentiment without reviews yields no summaries."""
+        await review_service.bulk_create_reviews(_reviews("positive"))
+        
+        assert await review_service.get_review_summaries_by_sentiment("neutral") == []
+
+
+class TestSentimentStatistics:
+    """get_sentiment_statistics grouping and cache tests."""
+    
+    @pytest.mark.asyncio
+    async def test_groups_counts_and_percentages(self, review_service):
+        """One row per sentiment becomes counts, percentages and the dominant sentiment."""
+        await review_service.bulk_create_reviews(
+            _reviews("positive", "positive", "negative", "neutral")
+        )
+        
+        statistics = await review_service.get_sentiment_statistics()
+        
+        assert statistics["total_reviews"] == 4
+        assert (statistics["positive"], statistics["negative"], statistics["neutral"]) == (2, 1, 1)
+        assert statistics["positive_percentage"] == 50.0
+        assert statistics["negative_percentage"] == 25.0
+        assert statistics["dominant_sentiment"] == "positive"
+    
+    @pytest.mark.asyncio
+    async def test_empty_table(self, review_service):
+        """No reviews, zero counts and no dominant sentiment."""
+        statistics = await review_service.get_sentiment_statistics()
+        
+        assert statistics["total_reviews"] == 0
+        assert statistics["dominant_sentiment"] is None
+    
+    @pytest.mark.asyncio
+    async def test_cached_until_invalidated(self, review_service, db_session):
+        """Writes that bypass the service are not seen while the cache is fresh."""
+        await review_service.create_review(_reviews("positive")[0])
+        assert (await review_service.get_sentiment_statistics())["total_reviews"] == 1
+        
+        await db_session.execute(insert(Review), [_reviews("negative")[0].model_dump()])
+        await db_session.commit()
+        assert (await review_service.get_sentiment_statistics())["total_reviews"] == 1
+        
+        invalidate_statistics_cache()
+        assert (await review_service.get_sentiment_statistics())["total_reviews"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_service_writes_invalidate_cache(self, review_service):
+        """Every write path through the service refreshes the next statistics read."""
+        review = await review_service.create_review(_reviews("positive")[0])
+        assert (await review_service.get_sentiment_statistics())["positive"] == 1
+        
+        await review_service.bulk_create_reviews(_reviews("negative"))
+        assert (await review_service.get_sentiment_statistics())["negative"] == 1
+        
+        await review_service.create_reviews_bulk(_reviews("neutral"))
+        assert (await review_service.get_sentiment_statistics())["neutral"] == 1
+        
+        await review_service.update_review(review.id, ReviewUpdate(sentiment="negative"))
+        statistics = await review_service.get_sentiment_statistics()
+        assert (statistics["positive"], statistics["negative"]) == (0, 2)
+        
+        await review_service.delete_review(review.id)
+        statistics = await review_service.get_sentiment_statistics()
+        assert (statistics["total_reviews"], statistics["negative"]) == (2, 1)
@@ -0,0 +1,125 @@
+"""
+Expired session cleanup tests.
+
+Tests the batched session sweep of the mock worker against the PostgreSQL
+test container.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infra.db.repo import UserSessionRepository
+from app.infra.db.sessions import UserSession, UserSessionPendingDeletion
+from app.workers.mock_worker import MockWorker
+
+
+pytestmark = pytest.mark.integration
+
+NOW = datetime.now(timezone.utc)
+CUTOFF = NOW - timedelta(days=30)
+
+
+@pytest.fixture
+def worker() -> MockWorker:
+    """Worker without a session factory; the sweep is given the test session."""
+    return MockWorker.__new__(MockWorker)
+
+
+async def _create_sessions(session: AsyncSession, prefix: str, count: int, last_activity: datetime):
+    """Create user sessions with the given last activity."""
+    user_sessions = [
+        UserSession(session_id=f"{prefix}-{i}", user_id="test_user", last_activity=last_activity)
+        for i in range(count)
+    ]
+    session.add_all(user_sessions)
+    await session.commit()
+    return user_sessions
+
+
+async def _session_ids(session: AsyncSession) -> List[str]:
+    result = await session.execute(select(UserSession.session_id).order_by(UserSession.session_id))
+    return list(result.scalars())
+
+
+async def _marks(session: AsyncSession) -> List[str]:
+    result = await session.execute(select(UserSessionPendingDeletion.marked_by))
+    return list(result.scalars())
+
+
+class TestSessionCleanup:
+    """MockWorker._delete_expired_sessions."""
+    
+    @pytest.mark.asyncio
+    async def test_deletes_expired_sessions_in_batches(self, db_session, worker, monkeypatch):
+        """Every expired session is deleted, one committed batch at a time."""
+        await _create_sessions(db_session, "expired", 5, CUTOFF - timedelta(days=1))
+        await _create_sessions(db_session, "active", 2, NOW)
+        
+        commits = 0
+        commit = db_session.commit
+        
+        async def counting_commit():
+            nonlocal commits
+            commits += 1
+            await commit()
+        
+        monkeypatch.setattr(db_session, "commit", counting_commit)
+        
+        deleted = await worker._delete_expired_sessions(db_session, CUTOFF, batch_size=2)
+        
+        assert deleted == 5
+        # Stale-mark takeover, then a mark and a delete transaction for each of
+        # the three batches (2 + 2 + 1), then the final empty mark
+        assert commits == 8
+        assert await _session_ids(db_session) == ["active-0", "active-1"]
+        assert await _marks(db_session) == []
+    
+    @pytest.mark.asyncio
+    async def test_takes_over_marks_of_crashed_sweep(self, db_session, worker, monkeypatch):
+        """Marks committed by a sweep that crashed before deleting are taken over once stale."""
+        await _create_sessions(db_session, "expired", 2, CUTOFF - timedelta(days=1))
+        
+        async def crash(self, marked_by):
+            raise RuntimeError("worker died")
+        
+        with monkeypatch.context() as patch:
+            patch.setattr(UserSessionRepository, "delete_marked_sessions", crash)
+            with pytest.raises(RuntimeError):
+                await worker._delete_expired_sessions(db_session, CUTOFF)
+        await db_session.rollback()
+        
+        # The mark transaction was committed before the crash
+        crashed_marks = await _marks(db_session)
+        assert len(crashed_marks) == 2 and len(set(crashed_marks)) == 1
+        
+        # Fresh marks may belong to a live sweep: skipped, not deleted
+        deleted = await worker._delete_expired_sessions(
+            db_session, CUTOFF, stale_after=timedelta(hours=1)
+        )
+        assert deleted == 0
+        assert await _session_ids(db_session) == ["expired-0", "expired-1"]
+        assert await _marks(db_session) == crashed_marks
+        
+        await db_session.execute(
+            update(UserSessionPendingDeletion).values(marked_at=NOW - timedelta(hours=2))
+        )
+        await db_session.commit()
+        
+        deleted = await worker._delete_expired_sessions(
+            db_session, CUTOFF, stale_after=timedelta(hours=1)
+        )
+        assert deleted == 2
+        assert await _session_ids(db_session) == []
+        assert await _marks(db_session) == []
+    
+    @pytest.mark.asyncio
+    async def test_nothing_expired(self, db_session, worker):
+        """A sweep with nothing to delete reports zero and leaves sessions in place."""
+        await _create_sessions(db_session, "active", 2, NOW)
+        
+        assert await worker._delete_expired_sessions(db_session, CUTOFF) == 0
+        assert await _session_ids(db_session) == ["active-0", "active-1"]
@@ -0,0 +1,90 @@
+"""
+Uploaded file validation tests.
+
+Tests the chunked content checks of TaskService, including content that
+spans the read chunk boundary.
+"""
+
+import io
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.tasks.service import FILE_READ_CHUNK_SIZE, TaskService
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def service() -> TaskService:
+    return TaskService(None)
+
+
+def _message(service: TaskService, content: bytes, file_ext: str):
+    """Return the validation error message, or None if the content is accepted."""
+    try:
+        service._validate_file_stream(io.BytesIO(content), file_ext, f"upload.{file_ext}")
+    except ValidationError as e:
+        return e.message
+    return None
+
+
+@pytest.mark.parametrize("content, file_ext, expected", [
+    (b"", "txt", "File cannot be empty"),
+    (b"   \n\t", "txt", "File cannot be empty"),
+    (b"\xff\xfe", "txt", "File must be valid UTF-8 text"),
+    (b"ab\x00c", "txt", "File contains null bytes"),
+    (b"a,b\n" + b"x" * 5001 + b",y", "csv", "CSV line 2 is too long (5003 characters)"),
+    (b"<SCRIPT>", "txt", "File contains potentially dangerous content: <script"),
+    (b'a,b\n"1,2', "csv", "CSV row 2 has 1 columns, expected 2"),
+    (b'a,b\n"1",2"', "csv", "CSV contains unclosed quotes"),
+    (b"ok text\nmore", "txt", None),
+    (b"a,b\n1,2", "csv", None),
+    (b'{"a": 1}', "json", None),
+])
+def test_file_content(service: TaskService, content: bytes, file_ext: str, expected):
+    """Each check rejects its input with its own message."""
+    assert _message(service, content, file_ext) == expected
+
+
+def test_invalid_json(service: TaskService):
+    """JSON files are parsed after the chunked checks."""
+    assert _message(service, b"{broken", "json").startswith("Invalid JSON format")
+
+
+def test_pattern_split_across_chunks(service: TaskService):
+    """A dangerous pattern straddling the chunk boundary is still found."""
+    content = b"a" * (FILE_READ_CHUNK_SIZE - 3) + b"javascript:"
+    expected = "File contains potentially dangerous content: javascript:"
+    assert _message(service, content, "txt") == expected
+
+
+def test_multibyte_character_split_across_chunks(service: TaskService):
+    """A UTF-8 sequence cut by the chunk boundary is decoded, not rejected."""
+    content = b"a" * (FILE_READ_CHUNK_SIZE - 1) + "é".encode()
+    assert _message(service, content, "txt") is None
+
+
+def test_long_line_spanning_chunks(service: TaskService):
+    """Line length is counted across chunks and reported in full."""
+    content = b"a,b\n" + b"x" * (2 * FILE_READ_CHUNK_SIZE) + b",y\n1,2"
+    expected = f"CSV line 2 is too long ({2 * FILE_READ_CHUNK_SIZE + 2} characters)"
+    assert _message(service, content, "csv") == expected
+
+
+def test_first_long_line_is_reported(service: TaskService):
+    """Only the first line over the limit is reported."""
+    content = b"a,b\n" + b"x" * 6000 + b"\n" + b"y" * 7000
+    assert _message(service, content, "csv") == "CSV line 2 is too long (6000 characters)"
+
+
+def test_file_path(service: TaskService, tmp_path):
+    """Files on disk go through the same checks."""
+    path = tmp_path / "upload.csv"
+    path.write_bytes(b"a,b\n1,2\n" * (FILE_READ_CHUNK_SIZE // 4))
+    service._validate_file_path(str(path), "csv", "upload.csv")
+
+    path.write_bytes(b"a,b\nonerror=,2")
+    with pytest.raises(ValidationError, match="dangerous content: onerror="):
+        service._validate_file_path(str(path), "csv", "upload.csv")
@@ -0,0 +1,176 @@
+"""
+ML service scoring tests.
+
+Tests that the dense float32 scoring path matches sklearn's predict_proba,
+and the chunked and micro-batched inference paths.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from app.core.config import settings
+from app.core.exceptions import InternalServerError
+from app.services.ml_service import MLService
+
+
+pytestmark = pytest.mark.unit
+
+
+def _scoring_service(model: LogisticRegression) -> MLService:
+    """Build a service around a fitted model, skipping stopword and model loading."""
+    service = MLService.__new__(MLService)
+    service.model = model
+    service._prepare_scoring()
+    return service
+
+
+@pytest.fixture
+def features():
+    """Sparse feature rows shaped like vectorizer output."""
+    rng = np.random.default_rng(0)
+    return sparse.csr_matrix(rng.random((30, 8)))
+
+
+class TestPredictProba:
+    """_predict_proba tests."""
+
+    @pytest.mark.parametrize("multi_class, n_classes", [
+        ("multinomial", 3),
+        ("multinomial", 2),
+        ("ovr", 3),
+        ("auto", 2),
+    ])
+    def test_matches_sklearn(self, features, multi_class: str, n_classes: int):
+        """Probabilities match predict_proba for multinomial, binary and OvR models."""
+        labels = np.arange(features.shape[0]) % n_classes
+        model = LogisticRegression(multi_class=multi_class).fit(features, labels)
+        service = _scoring_service(model)
+        
+        expected = model.predict_proba(features)
+        got = service._predict_proba(features)
+        
+        assert got.shape == expected.shape
+        np.testing.assert_allclose(got, expected, atol=1e-5)
+
+    @pytest.mark.parametrize("multi_class", ["auto", "deprecated"])
+    def test_binary_default_model_uses_predict_proba(self, features, multi_class: str):
+        """Binary models with the auto-detecting default are one-vs-rest, not mirrored."""
+        labels = np.arange(features.shape[0]) % 2
+        model = LogisticRegression().fit(features, labels)
+        # scikit-learn >= 1.5 stores "deprecated" as the default
+        model.multi_class = multi_class
+        service = _scoring_service(model)
+        
+        # Mirroring would score softmax([-d, d]) = sigmoid(2d), not sigmoid(d)
+        assert service._weights is None
+    
+    def test_binary_multinomial_uses_both_classes(self, features):
+        """A binary multinomial model is scored on two columns, not a one-column softmax."""
+        labels = np.arange(features.shape[0]) % 2
+        model = LogisticRegression(multi_class="multinomial").fit(features, labels)
+        service = _scoring_service(model)
+        
+        assert service._weights.shape == (features.shape[1], 2)
+        assert not np.allclose(service._predict_proba(features).max(axis=1), 1.0)
+
+
+TEXTS = [
+    "great product", "terrible quality", "okay I guess", "love it", "awful service",
+    "fine", "really great", "broken on arrival", "average value", "excellent",
+]
+
+
+@pytest.fixture
+def text_service() -> MLService:
+    """Service with a small fitted vectorizer and model, skipping NLTK and model files."""
+    service = MLService.__new__(MLService)
+    service._stop_words = frozenset()
+    service.vectorizer = TfidfVectorizer().fit(TEXTS)
+    labels = [1, 0, 2, 1, 0, 2, 1, 0, 2, 1]
+    service.model = LogisticRegression(multi_class="multinomial").fit(
+        service.vectorizer.transform(TEXTS), labels
+    )
+    service._prepare_scoring()
+    return service
+
+
+class TestAnalyzeSentimentBatch:
+    """analyze_sentiment_batch tests."""
+    
+    def test_results_keep_order_across_chunks(self, text_service):
+        """Chunk boundaries do not reorder or change results."""
+        expected = [text_service.analyze_sentiment(text) for text in TEXTS]
+        
+        for batch_size in (1, 3, 4, len(TEXTS)):
+            results = text_service.analyze_sentiment_batch(TEXTS, batch_size=batch_size)
+            assert [r["sentiment"] for r in results] == [e["sentiment"] for e in expected]
+            np.testing.assert_allclose(
+                [r["confidence"] for r in results], [e["confidence"] for e in expected],
+                atol=1e-6,
+            )
+    
+    def test_empty_input(self, text_service):
+        """No texts, no model calls."""
+        assert text_service.analyze_sentiment_batch([]) == []
+
+
+def _micro_batch_service(analyze_batch) -> MLService:
+    """Service whose batch inference is replaced by ``analyze_batch``."""
+    service = MLService.__new__(MLService)
+    service._inference_semaphore = asyncio.Semaphore(1)
+    service._pending = []
+    service._flush_task = None
+    service.analyze_sentiment_batch = analyze_batch
+    return service
+
+
+class TestAnalyzeSentimentAsync:
+    """Micro-batching of concurrent analyze_sentiment_async callers."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_get_their_own_results(self, monkeypatch):
+        """Concurrent texts are batched, and every future resolves to its own text's result."""
+        monkeypatch.setattr(settings, "batch_size", 3)
+        batches = []
+        
+        def analyze_batch(texts):
+            batches.append(list(texts))
+            return [{"text": text} for text in texts]
+        
+        service = _micro_batch_service(analyze_batch)
+        texts = [f"text {i}" for i in range(7)]
+        
+        results = await asyncio.gather(*(service.analyze_sentiment_async(t) for t in texts))
+        
+        assert results == [{"text": text} for text in texts]
+        assert batches == [texts[0:3], texts[3:6], texts[6:7]]
+    
+    @pytest.mark.asyncio
+    async def test_failed_batch_fails_each_caller_separately(self):
+        """Every caller of a failed batch gets its own error, chained to the cause."""
+        calls = []
+        
+        def analyze_batch(texts):
+            calls.append(list(texts))
+            if len(calls) == 1:
+                raise ValueError("model exploded")
+            return [{"text": text} for text in texts]
+        
+        service = _micro_batch_service(analyze_batch)
+        
+        results = await asyncio.gather(
+            *(service.analyze_sentiment_async(t) for t in ("a", "b", "c")),
+            return_exceptions=True,
+        )
+        
+        assert all(isinstance(r, InternalServerError) for r in results)
+        assert len({id(r) for r in results}) == 3
+        assert all(isinstance(r.__cause__, ValueError) for r in results)
+        
+        # The service keeps working after a failed batch
+        assert await service.analyze_sentiment_async("d") == {"text": "d"}
@@ -0,0 +1,65 @@
+"""
+Request schema validation tests.
+
+Tests the user_id and text checks of the task request schemas.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.tasks.schemas import SingleTaskRequest, validate_user_id
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestUserIdValidation:
+    """validate_user_id tests."""
+
+    def test_valid_user_id_is_stripped(self):
+        """Valid user IDs are returned without surrounding whitespace."""
+        assert validate_user_id("  user-42\t") == "user-42"
+
+    @pytest.mark.parametrize("user_id, message", [
+        ("a\x00b", "User ID cannot contain null bytes"),
+        ("a\nb", "User ID cannot contain control characters"),
+        ("a$b", "User ID contains potentially dangerous characters"),
+        ("xDropx", "User ID contains potentially dangerous SQL keywords"),
+    ])
+    def test_rejected_user_id(self, user_id: str, message: str):
+        """Each rule rejects its input with its own message."""
+        with pytest.raises(ValueError, match=message):
+            validate_user_id(user_id)
+
+    def test_first_rule_in_order_is_reported(self):
+        """With several violations, the earliest rule wins, not the earliest position."""
+        with pytest.raises(ValueError, match="User ID cannot contain control characters"):
+            validate_user_id("drop;\x01")
+
+    def test_unicode_case_folding_is_not_applied(self):
+        """Non-ASCII look-alikes (long s) are not folded into SQL keywords."""
+        assert validate_user_id("ſelect") == "ſelect"
+
+
+class TestTextValidation:
+    """SingleTaskRequest.text validation tests."""
+
+    @pytest.mark.parametrize("text, pattern", [
+        ("<SCRIPT>alert(1)</SCRIPT>", "<script"),
+        ("x; drop table tasks", "DROP TABLE"),
+        ("<a onClick=go()>", "onclick="),
+    ])
+    def test_dangerous_text_is_rejected(self, text: str, pattern: str):
+        """Dangerous fragments are matched case-insensitively and reported as listed."""
+        with pytest.raises(ValidationError, match=f"potentially dangerous content: {pattern}"):
+            SingleTaskRequest(user_id="abc", text=text)
+
+    def test_first_pattern_in_list_is_reported(self):
+        """With several fragments, the first pattern in list order is reported."""
+        with pytest.raises(ValidationError, match="dangerous content: <script"):
+            SingleTaskRequest(user_id="abc", text="'; -- then DROP TABLE t <script>")
+
+    @pytest.mark.parametrize("text", ["<ſcript>", "javaſcript:x"])
+    def test_unicode_case_folding_is_not_applied(self, text: str):
+        """Unicode case-fold variants are plain text, not an unhandled lookup error."""
+        assert SingleTaskRequest(user_id="abc", text=text).text == text
@@ -0,0 +1,90 @@
+"""
+Sentiment cache tests.
+
+Tests MLService.analyze_sentiment_cached against an in-memory Redis stand-in.
+"""
+
+from typing import Dict, List, Optional
+
+import orjson
+import pytest
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.services.ml_service import MLService
+
+
+pytestmark = pytest.mark.unit
+
+RESULT = {"sentiment": "positive", "confidence": 0.9}
+
+
+class FakeRedis:
+    """Minimal async Redis with get/setex, optionally failing every call."""
+    
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.data: Dict[str, bytes] = {}
+        self.ttls: Dict[str, int] = {}
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        if self.fail:
+            raise RedisError("connection refused")
+        return self.data.get(key)
+    
+    async def setex(self, key: str, ttl: int, value: bytes) -> None:
+        if self.fail:
+            raise RedisError("connection refused")
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+
+@pytest.fixture
+def service():
+    """Service whose inference records the texts it was asked to analyze."""
+    service = MLService.__new__(MLService)
+    service.analyzed: List[str] = []
+    
+    async def analyze_sentiment_async(text: str):
+        service.analyzed.append(text)
+        return RESULT
+    
+    service.analyze_sentiment_async = analyze_sentiment_async
+    return service
+
+
+@pytest.mark.asyncio
+async def test_miss_runs_inference_and_stores_result(service, monkeypatch):
+    """A miss runs inference once and stores the result with the cache TTL."""
+    monkeypatch.setattr(settings, "sentiment_cache_ttl_seconds", 120)
+    redis = FakeRedis()
+    
+    assert await service.analyze_sentiment_cached("great", redis) == RESULT
+    
+    assert service.analyzed == ["great"]
+    [(key, value)] = redis.data.items()
+    assert orjson.loads(value) == RESULT
+    assert redis.ttls[key] == 120
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_inference(service):
+    """Identical texts are served from the cache; other texts are not."""
+    redis = FakeRedis()
+    await service.analyze_sentiment_cached("great", redis)
+    
+    assert await service.analyze_sentiment_cached("great", redis) == RESULT
+    await service.analyze_sentiment_cached("awful", redis)
+    
+    assert service.analyzed == ["great", "awful"]
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_inference(service):
+    """Lookup and store failures are logged, not raised."""
+    redis = FakeRedis(fail=True)
+    
+    assert await service.analyze_sentiment_cached("great", redis) == RESULT
+    assert await service.analyze_sentiment_cached("great", redis) == RESULT
+    
+    assert service.analyzed == ["great", "great"]
@@ -0,0 +1,62 @@
+"""
+Upload spooling tests.
+
+Tests that uploads are copied to a temp file and that oversized uploads are
+rejected and cleaned up.
+"""
+
+import io
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.core.config import settings
+from app.tasks.exceptions import FileTooLarge
+from app.tasks.router import UPLOAD_CHUNK_SIZE, spool_upload
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def temp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "temp_dir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_upload_is_spooled_to_temp_file(temp_dir):
+    """The upload is copied chunk by chunk into settings.temp_dir."""
+    content = b"a,b\n1,2\n" * UPLOAD_CHUNK_SIZE
+    upload = UploadFile(io.BytesIO(content), filename="upload.csv")
+    
+    path = await spool_upload(upload, len(content) + 1)
+    
+    with open(path, "rb") as f:
+        assert f.read() == content
+    assert [str(p) for p in temp_dir.iterdir()] == [path]
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_reports_upload_size(temp_dir):
+    """An oversized upload reports its full size and leaves no temp file."""
+    content = b"x" * (3 * UPLOAD_CHUNK_SIZE)
+    upload = UploadFile(io.BytesIO(content), filename="upload.csv", size=len(content))
+    
+    with pytest.raises(FileTooLarge) as exc_info:
+        await spool_upload(upload, UPLOAD_CHUNK_SIZE)
+    
+    assert exc_info.value.details["file_size"] == len(content)
+    assert exc_info.value.details["max_size"] == UPLOAD_CHUNK_SIZE
+    assert list(temp_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_without_size_reports_limit(temp_dir):
+    """Without a known upload size, the limit is reported instead of a partial count."""
+    upload = UploadFile(io.BytesIO(b"x" * (3 * UPLOAD_CHUNK_SIZE)), filename="upload.csv")
+    
+    with pytest.raises(FileTooLarge) as exc_info:
+        await spool_upload(upload, UPLOAD_CHUNK_SIZE)
+    
+    assert exc_info.value.details["file_size"] == UPLOAD_CHUNK_SIZE